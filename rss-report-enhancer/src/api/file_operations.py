@@ -208,15 +208,21 @@ class FileOperations:
         Args:
             file_path: 削除するファイルのパス
         """
-        if file_path and os.path.exists(file_path):
-            try:
-                os.unlink(file_path)
-                self.helper.log_info(f"Temporary file deleted: {file_path}")
-                
-                if file_path in self.temp_files:
-                    self.temp_files.remove(file_path)
-            except Exception as e:
-                self.helper.log_warning(f"Failed to delete temp file {file_path}: {str(e)}")
+        if not file_path:
+            return
+        
+        # 存在確認をせずに削除を試みる（既に存在しない場合も追跡対象から外す）
+        try:
+            os.unlink(file_path)
+            self.helper.log_info(f"Temporary file deleted: {file_path}")
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            self.helper.log_warning(f"Failed to delete temp file {file_path}: {str(e)}")
+            return
+        
+        if file_path in self.temp_files:
+            self.temp_files.remove(file_path)
 
     def _cleanup_all_temp_files(self) -> None:
         """すべての追跡されている一時ファイルを削除"""
@@ -7,6 +7,7 @@ URLから記事コンテンツを取得し、HTMLの解析とPDF変換機能を
 """
 
 import os
+import atexit
 import tempfile
 import pdfkit
 import newspaper
@@ -15,11 +16,986 @@ import time
 import random
 import traceback
 import subprocess
-from urllib.parse import urlparse, urljoin
+import queue
+import copy
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse, urlsplit, urljoin
 from newspaper import Article, Config
+from newspaper.extractors import ContentExtractor
+from readability import Document
+from readability.htmls import build_doc
 from datetime import datetime
 from lxml import html, etree
+from lxml.html.clean import Cleaner
+from lxml.cssselect import CSSSelector
 import re
+import string
+
+
+# ===== プリコンパイル済み正規表現 =====
+
+# レイアウト判定
+_DISPLAY_GRID_RE = re.compile(r'display\s*:\s*grid')
+_DISPLAY_FLEX_RE = re.compile(r'display\s*:\s*flex')
+
+# 複数パターンを1回の走査で検出するための正規表現
+_CONTENT_MARKERS = re.compile(r'<article|<div class="content"|<div class="article"|<main')
+
+# 画像強化: 広告・アイコンらしい画像（class/srcのいずれかに含まれる語）
+_AD_IMG_RE = re.compile(r'ad|banner|icon|logo', re.IGNORECASE)
+
+# 記事抽出: 画像URLの収集
+_IMG_SRC_XPATH = etree.XPath('//img/@src')
+
+# 記事抽出: 本文テキストを構成するブロック要素
+_TEXT_BLOCK_TAGS = ('p', 'h2', 'h3', 'h4', 'li', 'pre')
+
+# 画像強化: メインコンテンツエリア内の画像（全エリアを1つのセレクタに統合して起動時にコンパイル）
+_CONTENT_IMG_SELECTOR = CSSSelector(', '.join(
+    f'{area} img' for area in (
+        'article', '.article', '.content', 'main', '.main', '.post',
+        '.entry', '[itemprop="articleBody"]', '.story'
+    )
+), translator='html')
+
+# 画像強化: コンテンツ画像に追加するインラインスタイル
+_IMG_PRESERVE_STYLE = 'max-width: 100% !important; height: auto !important;'
+
+# 選択的クリーニング: 除去対象の要素（lxml）
+_AD_TOKENS = r'(^|[^a-z0-9])(ads?|advert|advertisement|banner|sponsor|sponsored|promo)([^a-z0-9]|$)'
+_SOCIAL_TOKENS = r'(^|[^a-z0-9])(social|share|sharing|related|recommend|recommended)([^a-z0-9]|$)'
+_LAYOUT_REMOVE_XPATH = etree.XPath(
+    '//aside'
+    f' | //div[re:test(concat(@class, " ", @id), "{_AD_TOKENS}", "i")]'
+    f' | //div[re:test(concat(@class, " ", @id), "{_SOCIAL_TOKENS}", "i")]'
+    f' | //iframe[re:test(concat(@src, " ", @class, " ", @id), "{_AD_TOKENS}|doubleclick", "i")]',
+    namespaces={'re': 'http://exslt.org/regular-expressions'}
+)
+
+# 選択的クリーニング: スクリプトのみを除去するCleaner（その他の要素・属性には触れない）
+_SCRIPT_CLEANER = Cleaner(
+    scripts=True, javascript=False, comments=False, style=False, inline_style=False,
+    links=False, meta=False, page_structure=False, processing_instructions=False,
+    embedded=False, frames=False, forms=False, annoying_tags=False,
+    remove_unknown_tags=False, safe_attrs_only=False
+)
+
+# 選択的クリーニング（lxmlで解析できない場合の正規表現版）: 除去対象（1回の走査で全パターンを除去するため1つの選択に統合）
+# スクリプトとiframeはバックトラックの多い正規表現を避けて _strip_elements() で除去する
+# 閉じられていない要素や巨大な開始タグで走査が爆発しないよう、
+# 開始タグ内は1000文字、要素の中身は10000文字までに量指定子を制限する
+_LAYOUT_CLEAN_RE = re.compile('|'.join((
+    # 広告関連
+    r'<div[^>]{0,1000}(?:ad|advertisement|banner|sponsor|promo)[^>]{0,1000}>.{0,10000}?</div>',
+    # サイドバー要素
+    r'<aside[^>]{0,1000}>.{0,10000}?</aside>',
+    # ソーシャルボタン、関連記事
+    r'<div[^>]{0,1000}(?:social|share|related|recommend)[^>]{0,1000}>.{0,10000}?</div>',
+    # オンロードハンドラなどのJavaScriptイベント（onerror/onfocus等も含む全てのon*属性）
+    r'''\son[a-z]+\s*=\s*(?:"[^"]*"|'[^']*')''',
+)), re.DOTALL | re.IGNORECASE)
+
+# 選択的クリーニング: グリッド/フレックス/固定配置をブロック/静的配置に置換
+_LAYOUT_FIX_RE = re.compile(
+    r'(?P<display>display\s*:\s*(?:grid|flex)[^;]*;)|position\s*:\s*(?:fixed|sticky)[^;]*;'
+)
+
+
+def _layout_fix_replacement(match):
+    """_LAYOUT_FIX_REの一致箇所に対応する置換文字列を返す"""
+    return 'display: block;' if match.group('display') else 'position: static;'
+
+
+# レイアウト前処理: 問題のあるスクリプト/iframe（開始タグにいずれかの語を含むもの）
+_PROBLEMATIC_SCRIPT_KEYWORDS = (
+    'google-analytics', 'gtm.js', 'facebook', 'twitter', 'ads', 'analytics', 'tracker'
+)
+_PROBLEMATIC_IFRAME_KEYWORDS = ('advertisement', 'ads', 'youtube', 'vimeo')
+
+# 選択的クリーニング（正規表現版）: 除去対象のiframe（動画埋め込みを除く）
+_AD_IFRAME_KEYWORDS = ('ad', 'advertisement', 'banner')
+
+# 要素の開始/終了タグ（大文字小文字を区別しない単純なリテラル検索）
+_ELEMENT_TAG_RES = {
+    tag: (re.compile(rf'<{tag}\b', re.IGNORECASE), re.compile(rf'</{tag}\s*>', re.IGNORECASE))
+    for tag in ('script', 'iframe')
+}
+
+
+def _strip_elements(html_content, tag, keywords=None):
+    """
+    開始タグから最初の終了タグまでを線形走査で除去
+    
+    入れ子の量指定子を含む正規表現は悪意のある入力で極端なバックトラックを
+    起こすため、開始タグ・終了タグの位置を順に探すだけの走査で除去する。
+    終了タグのない要素はそのまま残す。
+    
+    Args:
+        html_content: HTML文字列
+        tag: 除去する要素名（'script' または 'iframe'）
+        keywords: 指定時は開始タグにいずれかの語を含む要素のみ除去
+        
+    Returns:
+        str: 要素を除去したHTML
+    """
+    open_re, close_re = _ELEMENT_TAG_RES[tag]
+    parts = []
+    start = 0
+    pos = 0
+    while True:
+        open_match = open_re.search(html_content, pos)
+        if not open_match:
+            break
+        tag_end = html_content.find('>', open_match.end())
+        if tag_end == -1:
+            break
+        close_match = close_re.search(html_content, tag_end + 1)
+        if not close_match:
+            break
+        if keywords is None or _contains_any(html_content[open_match.start():tag_end].lower(), keywords):
+            parts.append(html_content[start:open_match.start()])
+            start = close_match.end()
+        pos = close_match.end()
+    
+    if not parts:
+        return html_content
+    parts.append(html_content[start:])
+    return "".join(parts)
+
+
+# WordPress検出
+# 各正規表現の前に、マッチに必須のリテラル文字列を `in` で確認して
+# 明らかに一致しないページでは正規表現の全文走査を省略する。
+# 同種のパターンは1つの正規表現に統合し、走査回数を減らす。
+# IGNORECASE のパターンは小文字化したHTMLに対してリテラルを確認する。
+_WP_META_GENERATOR_RE = re.compile(
+    r'<meta[^>]*name=["\']generator["\'][^>]*content=["\']WordPress', re.IGNORECASE
+)
+_WP_RESOURCE_MARKERS = ('wp-content', 'wp-includes')
+_WP_CLASS_TOKENS = (
+    'wp-block-', 'entry-content', 'post-content', 'the-content',
+    'widget-area', 'site-header', 'site-footer', 'wp-caption'
+)
+_WP_CLASS_RE = re.compile(
+    r'class=["\'][^"\']*(?P<wp_class>' + '|'.join(map(re.escape, _WP_CLASS_TOKENS)) + ')'
+)
+_BLOGGER_IMAGE_MARKER = 'blogger.googleusercontent.com/img/'
+_BLOG_PERMALINK_RE = re.compile(r'/(20\d{2})/(0[1-9]|1[0-2])/[\w-]+\.html')
+_WP_JS_NEEDLES = ('wp-', 'jquery/', '_wpnonce')
+_WP_JS_MARKERS = re.compile(
+    r'wp-embed\.min\.js|wp-emoji-release\.min\.js|jquery/jquery\.js\?ver=|wp-includes/js/|_wpnonce'
+)
+_MARKDOWN_LINK_RE = re.compile(r'\[[\w\s]+\]\(https?://[^\)]+\)')
+
+# 記事構造パターン（3グループを1つの正規表現に統合し、1回の走査で判定）
+_WP_STRUCTURE_PATTERNS = (
+    # 拡張WordPress記事構造
+    ('article', 'extended article pattern', (
+        # 記事コンテナ
+        (('<article',), r'<article[^>]*class=["\'][^"\']*(?:post|entry|blog-post)'),
+        # 投稿タイトル
+        (('post-title', 'entry-title'), r'<h\d[^>]*class=["\'][^"\']*(?:post-title|entry-title)'),
+        # 投稿メタ情報
+        (('post-meta', 'entry-meta'), r'<div[^>]*class=["\'][^"\']*(?:post-meta|entry-meta)'),
+        # 一般的なコメントセクション
+        (('comments', 'respond'), r'<div[^>]*id=["\'](?:comments|respond)'),
+        # 共有ボタン
+        (('share-buttons', 'social-share'), r'<div[^>]*class=["\'][^"\']*(?:share-buttons|social-share)'),
+        # 典型的なRSS/AtomフィードURL
+        (('+xml',), r'<link[^>]*rel=["\']alternate["\'][^>]*type=["\']application/(?:rss\+xml|atom\+xml)'),
+    )),
+    # 拡張記事構造（TheRecord）- 量指定子は _LAYOUT_CLEAN_RE と同じ上限で制限
+    ('enhanced', 'enhanced article structure pattern', (
+        # レポーター/著者情報ブロック
+        (('author', 'byline'), r'<div[^>]{0,1000}(?:author|byline)[^>]{0,1000}>.{0,10000}?<\/div>'),
+        # 関連記事セクションパターン
+        (('related', 'more-stories'), r'<div[^>]{0,1000}(?:related|more-stories)[^>]{0,1000}>.{0,10000}?<\/div>'),
+        # 記事メタデータパターン
+        (('meta', 'article-info'), r'<div[^>]{0,1000}(?:meta|article-info)[^>]{0,1000}>.{0,10000}?<\/div>'),
+    )),
+    # ヘッダー/フッター構造（HackerNewsの拡張）
+    ('header_footer', 'header/footer pattern', (
+        (('site-header', 'main-header'), r'<header[^>]*class=["\'][^"\']*(?:site-header|main-header)'),
+        (('site-footer', 'main-footer'), r'<footer[^>]*class=["\'][^"\']*(?:site-footer|main-footer)'),
+        (('copyright', 'site-info'), r'<div[^>]*class=["\'][^"\']*(?:copyright|site-info)'),
+    )),
+)
+_WP_STRUCTURE_RE = re.compile('|'.join(
+    f'(?P<{name}>' + '|'.join(f'(?:{pattern})' for _, pattern in patterns) + ')'
+    for name, _, patterns in _WP_STRUCTURE_PATTERNS
+), re.IGNORECASE | re.DOTALL)
+_WP_STRUCTURE_NEEDLES = tuple(
+    needle
+    for _, _, patterns in _WP_STRUCTURE_PATTERNS
+    for needles, _ in patterns
+    for needle in needles
+)
+_WP_STRUCTURE_LABELS = {name: label for name, label, _ in _WP_STRUCTURE_PATTERNS}
+
+
+# WordPress処理: CSSセレクタは起動時に1回だけXPathへ変換しておく
+def _compile_selectors(selectors):
+    """
+    CSSセレクタのリストをコンパイル済みセレクタのタプルに変換
+    
+    Args:
+        selectors: CSSセレクタ文字列のリスト
+        
+    Returns:
+        tuple: (セレクタ文字列, CSSSelector) のタプル
+    """
+    return tuple((selector, CSSSelector(selector, translator='html')) for selector in selectors)
+
+
+# 不要な要素（1回の走査で全て検出するためXPathの和集合に統合）
+_WP_REMOVE_SELECTOR = CSSSelector(', '.join((
+    # コメントセクションなど既存の削除対象
+    '.comments-area', '#comments', '.comment-respond',
+    '.sidebar', '.widget-area', '.widgets-list',
+    '.related-posts', '.yarpp', '.jp-relatedposts',
+    '.sharedaddy', '.share-buttons', '.social-share',
+    '.post-navigation', '.nav-links', '.prev-next',
+    '.advertisement', '.adsbygoogle', '[id*="gpt"]', '[class*="ads-"]',
+    # さらに追加の不要要素
+    '.popup', '.modal', '.cookie-notice', '.gdpr',
+    'script', 'iframe[src*="ads"]', 'iframe[src*="doubleclick"]'
+)), translator='html')
+
+# メインコンテンツ - 優先順位付きセレクタリスト
+_WP_MAIN_SELECTORS = _compile_selectors([
+    'article.post', # 最優先
+    'article .entry-content',
+    '.post-content',
+    '.post .entry-content',
+    'article.post',
+    '.the-content',
+    '#content .post',
+    '.entry-content',
+    'article',
+    '.post',
+    '.content',
+    # 追加セレクタ
+    'main',
+    '.main-content',
+    '#primary',
+    '.site-content article'
+])
+
+# テーマ固有のメインコンテンツセレクタ（通常のセレクタより優先）
+_WP_THEME_MAIN_SELECTORS = {
+    theme: _compile_selectors(selectors) + _WP_MAIN_SELECTORS
+    for themes, selectors in (
+        (('twentytwenty', 'twentytwentyone', 'twentytwentytwo'), ['article .entry', '.entry-content']),
+        (('astra', 'generatepress', 'oceanwp'), ['.content-area', '.ast-article-single']),
+    )
+    for theme in themes
+}
+
+_WP_TITLE_SELECTORS = _compile_selectors(['h1.entry-title', 'h1.post-title', '.post h1', 'h1.title', 'header h1'])
+_WP_DATE_SELECTORS = _compile_selectors(['.posted-on time', '.entry-date', '.post-date', 'time.entry-date', 'meta time'])
+_WP_AUTHOR_SELECTORS = _compile_selectors(['.author', '.byline', '.post-author', '.entry-author'])
+_WP_IMAGE_SELECTORS = _compile_selectors(['.post-thumbnail img', '.featured-image img', '.post-image img', 'article img:first-child'])
+
+
+# テーマ名、著者名の接頭辞（"By "など）、WordPressのショートコード
+_WP_THEME_RE = re.compile(r'wp-content/themes/([^/]+)')
+_AUTHOR_PREFIX_RE = re.compile(r'^(By|Posted by|Author[:]?)\s*', re.IGNORECASE)
+_SHORTCODE_RE = re.compile(r'\[\/?[a-zA-Z0-9_-]+(?:\s[^\]]+)?\]')
+
+
+def _select_first(doc, selectors):
+    """
+    優先順位付きセレクタで最初に一致した要素を取得
+    
+    Args:
+        doc: lxmlの要素
+        selectors: _compile_selectors() で作成したタプル
+        
+    Returns:
+        tuple: (一致したセレクタ文字列, 要素)。一致しない場合は (None, None)
+    """
+    for selector, compiled in selectors:
+        elements = compiled(doc)
+        if elements:
+            return selector, elements[0]
+    return None, None
+
+
+def _contains_any(text, needles):
+    """
+    いずれかのリテラル文字列がテキストに含まれるかを判定
+    
+    Args:
+        text: 対象テキスト
+        needles: リテラル文字列のタプル
+        
+    Returns:
+        bool: いずれかが含まれる場合True
+    """
+    for needle in needles:
+        if needle in text:
+            return True
+    return False
+
+# 英数字（[a-zA-Z0-9]）のバイト集合
+_ALNUM_BYTES = (string.ascii_letters + string.digits).encode('ascii')
+
+
+# WordPress処理: 本文画像に設定するレスポンシブ用スタイル
+_RESPONSIVE_STYLE = 'max-width: 100%; height: auto;'
+
+# 変換不要なURLの接頭辞（絶対URL / 絶対URL・ページ内リンク・メールリンク）
+_ABSOLUTE_URL_PREFIXES = ('http://', 'https://')
+_LINK_SKIP_PREFIXES = _ABSOLUTE_URL_PREFIXES + ('#', 'mailto:')
+
+
+@functools.lru_cache(maxsize=256)
+def _base_url_tag(url):
+    """
+    記事URLから<base>タグを生成（同じURLの再解析を避けるためキャッシュ）
+    
+    Args:
+        url: 記事URL
+        
+    Returns:
+        str: <base>タグ（生成できない場合は空文字列）
+    """
+    try:
+        parsed_url = urlparse(url)
+    except ValueError:
+        return ""
+    return f'<base href="{parsed_url.scheme}://{parsed_url.netloc}/">'
+
+
+def _fast_urljoin(base_url, parsed_base, ref):
+    """
+    よくある形式の相対URLを再解析せずに絶対URLへ変換
+    
+    Args:
+        base_url: 基準URL
+        parsed_base: urlsplit(base_url) の結果
+        ref: 変換対象のURL
+        
+    Returns:
+        str: 絶対URL
+    """
+    if ref.startswith(_ABSOLUTE_URL_PREFIXES):
+        return ref
+    if ref.startswith('//'):
+        return f"{parsed_base.scheme}:{ref}"
+    if ref.startswith('/') and '/.' not in ref:
+        return f"{parsed_base.scheme}://{parsed_base.netloc}{ref}"
+    # それ以外（相対パス、"./" や "../" を含むパスなど）は標準の解決に任せる
+    return urljoin(base_url, ref)
+
+
+@functools.lru_cache(maxsize=256)
+def _split_base_url(base_url):
+    """
+    基準URLを分解（同じ記事URLの再解析を避けるためキャッシュ）
+    
+    Args:
+        base_url: 基準URL
+        
+    Returns:
+        SplitResult: urlsplitの結果
+    """
+    return urlsplit(base_url)
+
+
+def _cached_urljoin(cache, base_url, ref):
+    """
+    文書内で同じ相対URLを繰り返し解決しないよう_fast_urljoinの結果をキャッシュ
+    
+    Args:
+        cache: 文書ごとのキャッシュ辞書（相対URL → 絶対URL）
+        base_url: 基準URL
+        ref: 変換対象のURL
+        
+    Returns:
+        str: 絶対URL
+    """
+    absolute = cache.get(ref)
+    if absolute is None:
+        absolute = cache[ref] = _fast_urljoin(base_url, _split_base_url(base_url), ref)
+    return absolute
+
+
+def _count_alnum(html_content):
+    """
+    HTML中の英数字の数を集計
+    
+    正規表現のfindallは一致ごとに文字列を生成するため、C実装のtranslateで数える。
+    非ASCII文字を除いたバイト列から英数字を削除した差分で求める。
+    
+    Args:
+        html_content: HTML内容
+        
+    Returns:
+        int: 英数字の数
+    """
+    ascii_bytes = html_content.encode('ascii', 'ignore')
+    return len(ascii_bytes) - len(ascii_bytes.translate(None, _ALNUM_BYTES))
+
+
+def _count_layout_tags(html_content):
+    """
+    レイアウトの複雑さの判定に使うタグの数を集計
+    
+    Args:
+        html_content: HTML内容
+        
+    Returns:
+        tuple: (<div数, <script数, <section数, <article数)
+    """
+    return (
+        html_content.count('<div'),
+        html_content.count('<script'),
+        html_content.count('<section'),
+        html_content.count('<article'),
+    )
+
+
+# ===== PDF出力用CSS =====
+
+# レイアウト前処理でhead内に追加するCSS
+_PDF_CSS = """
+<style>
+    @page {
+        size: A4;
+        margin: 10mm 10mm 15mm 10mm;
+    }
+
+    /* リンクのスタイル保持 */
+    a {
+        color: inherit;
+        text-decoration: inherit;
+    }
+
+    /* 画像の適切な拡大縮小 */
+    img {
+        max-width: 100%;
+        height: auto;
+        page-break-inside: avoid;
+    }
+
+    /* 改ページコントロール */
+    h1, h2, h3, h4, h5, h6 {
+        page-break-after: avoid;
+        page-break-inside: avoid;
+    }
+
+    /* テーブルレイアウト保持 */
+    table {
+        border-collapse: collapse;
+        width: 100%;
+        page-break-inside: avoid;
+    }
+
+    /* フッタースタイル */
+    .pdf-footer {
+        text-align: center;
+        font-size: 9pt;
+        color: #666;
+        margin-top: 20px;
+        padding-top: 10px;
+        border-top: 1px solid #ccc;
+    }
+</style>
+"""
+
+# 抽出記事から再構築するHTML用のCSS
+_ARTICLE_CSS = """
+<style>
+    /* ページ設定 */
+    @page {
+        size: A4;
+        margin: 10mm 10mm 15mm 10mm;
+    }
+
+    /* 基本設定 */
+    body {
+        font-family: Arial, Helvetica, sans-serif;
+        font-size: 12pt;
+        line-height: 1.5;
+        color: #000;
+        background-color: #fff;
+        margin: 0;
+        padding: 20px;
+    }
+
+    /* 記事コンテナ */
+    .article-container {
+        max-width: 100%;
+        margin: 0 auto;
+    }
+
+    /* タイトル */
+    .article-title {
+        font-size: 24pt;
+        font-weight: bold;
+        margin-bottom: 20px;
+        line-height: 1.2;
+        color: #333;
+    }
+
+    /* メイン画像 */
+    .main-image {
+        max-width: 100%;
+        height: auto;
+        margin: 20px 0;
+        display: block;
+    }
+
+    /* 記事本文 */
+    .article-content {
+        margin-top: 20px;
+        font-size: 12pt;
+        line-height: 1.6;
+    }
+
+    /* 段落 */
+    .article-content p {
+        margin: 12px 0;
+    }
+
+    /* 画像 */
+    .article-content img {
+        max-width: 100%;
+        height: auto;
+        margin: 15px 0;
+        display: block;
+    }
+
+    /* フッター */
+    .article-footer {
+        margin-top: 30px;
+        padding-top: 10px;
+        border-top: 1px solid #ccc;
+        font-size: 10pt;
+        color: #666;
+        text-align: center;
+    }
+</style>
+"""
+
+# lxmlのドキュメントに追加する_PDF_CSSの要素（追加時は複製して使用）
+_PDF_STYLE_ELEMENT = html.fragment_fromstring(_PDF_CSS.strip())
+
+# PDF変換直前に追加するレイアウト修復CSS
+_LAYOUT_REPAIR_CSS = """
+<style>
+    /* 本文コンテンツの強制表示 */
+    article, .article, main, .main, .content, .post, .entry, [itemprop="articleBody"], .story {
+        display: block !important;
+        width: 100% !important;
+        max-width: 100% !important;
+        position: static !important;
+        overflow: visible !important;
+        padding: 10px 0 !important;
+        margin: 0 auto !important;
+        float: none !important;
+    }
+
+    /* コンテンツ画像の保持と最適化 */
+    .content-image-preserve {
+        display: block !important;
+        max-width: 90% !important;
+        height: auto !important;
+        margin: 10px auto !important;
+        page-break-inside: avoid !important;
+    }
+
+    /* 見出し最適化 */
+    h1, h2, h3 {
+        page-break-after: avoid !important;
+        margin-top: 20px !important;
+        margin-bottom: 10px !important;
+    }
+
+    /* テキスト最適化 */
+    p {
+        margin: 10px 0 !important;
+        line-height: 1.5 !important;
+    }
+
+    /* 大きな画像のページ内表示 */
+    img {
+        page-break-inside: avoid !important;
+    }
+
+    /* フッタースタイル */
+    .pdf-footer {
+        text-align: center;
+        font-size: 9pt;
+        color: #666;
+        margin-top: 20px;
+        padding-top: 10px;
+        border-top: 1px solid #ccc;
+    }
+</style>
+"""
+
+
+# WordPress処理: 基本CSS（すべてのテーマに適用）
+_WP_BASE_CSS = """
+<style>
+    /* 基本レイアウト */
+    body {
+        font-family: -apple-system, BlinkMacSystemFont, "Segoe UI", Roboto, Oxygen-Sans, Ubuntu, Cantarell, "Helvetica Neue", sans-serif;
+        font-size: 16px;
+        line-height: 1.8;
+        color: #333;
+        margin: 0;
+        padding: 0;
+        background: #fff;
+    }
+    #page {
+        max-width: 1200px;
+        margin: 0 auto;
+        padding: 2em;
+    }
+    #content {
+        width: 100%;
+    }
+
+    /* タイトルとヘッダー */
+    .entry-title {
+        font-size: 2.5em;
+        line-height: 1.2;
+        margin-bottom: 0.5em;
+        color: #222;
+        font-weight: 700;
+    }
+    .entry-meta {
+        font-size: 0.9em;
+        color: #666;
+        margin-bottom: 2em;
+    }
+    .byline, .posted-on {
+        margin-right: 1em;
+    }
+
+    /* アイキャッチ画像 */
+    .post-thumbnail {
+        margin-bottom: 2em;
+        text-align: center;
+    }
+    .post-thumbnail img {
+        max-width: 100%;
+        height: auto;
+        border-radius: 4px;
+    }
+
+    /* 記事コンテンツ */
+    .entry-content {
+        font-size: 1.1em;
+        line-height: 1.8;
+    }
+    .entry-content p {
+        margin-bottom: 1.5em;
+    }
+    .entry-content h2 {
+        font-size: 1.8em;
+        margin-top: 1.5em;
+        margin-bottom: 0.8em;
+        padding-bottom: 0.3em;
+        border-bottom: 1px solid #eee;
+    }
+    .entry-content h3 {
+        font-size: 1.5em;
+        margin-top: 1.5em;
+        margin-bottom: 0.8em;
+    }
+    .entry-content ul, .entry-content ol {
+        margin-bottom: 1.5em;
+        padding-left: 2em;
+    }
+    .entry-content li {
+        margin-bottom: 0.5em;
+    }
+    .entry-content a {
+        color: #0066cc;
+        text-decoration: none;
+    }
+    .entry-content a:hover {
+        text-decoration: underline;
+    }
+    .entry-content img {
+        max-width: 100%;
+        height: auto;
+        margin: 1.5em 0;
+        border-radius: 4px;
+    }
+    .entry-content blockquote {
+        border-left: 4px solid #eee;
+        padding-left: 1.5em;
+        margin-left: 0;
+        color: #666;
+        font-style: italic;
+    }
+    .entry-content pre, .entry-content code {
+        background: #f5f5f5;
+        border-radius: 3px;
+        padding: 0.2em 0.4em;
+        font-family: monospace;
+    }
+    .entry-content pre {
+        padding: 1em;
+        overflow-x: auto;
+    }
+
+    /* フッター */
+    .entry-footer {
+        margin-top: 3em;
+        padding-top: 1em;
+        border-top: 1px solid #eee;
+        font-size: 0.9em;
+        color: #666;
+    }
+    .source-link {
+        margin-top: 1em;
+    }
+
+    /* 印刷用最適化 */
+    @page {
+        margin: 1.5cm;
+    }
+    @media print {
+        body {
+            font-size: 12pt;
+        }
+        a {
+            text-decoration: none;
+            color: #000;
+        }
+        .entry-title {
+            font-size: 24pt;
+        }
+        .entry-content {
+            font-size: 12pt;
+        }
+    }
+</style>
+"""
+
+# WordPress処理: テーマ固有のCSS
+_WP_CLASSIC_THEME_CSS = """
+<style>
+    body.wordpress-theme {
+        font-family: "Inter", -apple-system, BlinkMacSystemFont, "Segoe UI", Roboto, Oxygen-Sans, Ubuntu, Cantarell, "Helvetica Neue", sans-serif;
+    }
+    .entry-title {
+        font-weight: 800;
+    }
+    .entry-content h2 {
+        font-weight: 700;
+    }
+</style>
+"""
+_WP_ASTRA_THEME_CSS = """
+<style>
+    body.wordpress-theme {
+        font-size: 17px;
+        line-height: 1.7;
+    }
+    .entry-title {
+        font-weight: 600;
+    }
+</style>
+"""
+
+# WordPress処理: テーマ名 → 基本CSSとテーマ固有CSSを連結済みのCSS
+_WP_THEME_CSS = {
+    **dict.fromkeys(('twentytwenty', 'twentytwentyone', 'twentytwentytwo'), _WP_BASE_CSS + _WP_CLASSIC_THEME_CSS),
+    **dict.fromkeys(('astra', 'generatepress'), _WP_BASE_CSS + _WP_ASTRA_THEME_CSS),
+}
+
+# WordPress処理: 再構築するHTML文書のテンプレート
+_WP_DOC_TEMPLATE = """<!DOCTYPE html>
+<html>
+<head>
+    <meta charset="UTF-8">
+    <title>{title}</title>
+    {wordpress_style}
+</head>
+<body class="wordpress-theme {theme_class}">
+    <div id="page" class="site">
+        <div id="content" class="site-content">
+            <article class="post">
+                <header class="entry-header">
+                    <h1 class="entry-title">{title}</h1>
+                    <div class="entry-meta">
+                        {meta}
+                    </div>
+                </header>
+
+                {thumbnail}
+
+                <div class="entry-content">
+                    {main_html}
+                </div>
+
+                <footer class="entry-footer">
+                    <div class="source-link">
+                        Source: <a href="{url}">{url}</a>
+                    </div>
+                </footer>
+            </article>
+        </div>
+    </div>
+</body>
+</html>
+"""
+
+
+def _escape_format_braces(text):
+    """str.format用に波括弧をエスケープ"""
+    return text.replace('{', '{{').replace('}', '}}')
+
+
+@functools.lru_cache(maxsize=32)
+def _wp_theme_doc_template(theme_class, wordpress_style):
+    """
+    テーマ固有部分（CSSとbodyクラス）を埋め込み済みの文書テンプレートを取得
+    
+    同じフィードの記事はテーマが共通のため、記事ごとに変わる部分だけを後から埋め込む。
+    
+    Args:
+        theme_class: bodyに付与するテーマクラス名
+        wordpress_style: テーマ用のスタイルタグ
+        
+    Returns:
+        str: 記事固有のプレースホルダのみが残ったテンプレート
+    """
+    return (_WP_DOC_TEMPLATE
+            .replace('{wordpress_style}', _escape_format_braces(wordpress_style))
+            .replace('{theme_class}', _escape_format_braces(theme_class)))
+
+
+class _WkPool:
+    """
+    常駐wkhtmltopdfプロセスのプール
+    
+    --read-args-from-stdin で起動したプロセスに「入力HTML 出力PDF」の行を送り、
+    Qt/WebKitの起動コストを複数の変換で共有する。
+    """
+    
+    POLL_INTERVAL = 0.05
+    
+    def __init__(self, wkhtmltopdf_path, options, env=None, size=None):
+        """
+        初期化
+        
+        Args:
+            wkhtmltopdf_path: wkhtmltopdfのパス
+            options: 全変換で共通のコマンドラインオプション
+            env: ワーカープロセスの環境変数
+            size: ワーカー数 (省略時は min(CPU数, 4))
+        """
+        self.wkhtmltopdf_path = wkhtmltopdf_path
+        self.options = list(options)
+        self.env = env
+        self.size = size or min(os.cpu_count() or 1, 4)
+        self._idle = queue.Queue()
+        for _ in range(self.size):
+            self._idle.put(self._spawn())
+    
+    def _spawn(self):
+        """ワーカープロセスを起動（エラー出力は診断できるよう親プロセスのstderrに流す）"""
+        return subprocess.Popen(
+            [self.wkhtmltopdf_path, "--read-args-from-stdin"] + self.options,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.DEVNULL,
+            env=self.env
+        )
+    
+    def convert(self, paths_future, extra_args=(), timeout=120):
+        """
+        空いているワーカーで1件変換し、PDFが書き終わるまで待機
+        
+        一時ファイルの書き込みは呼び出し側で別スレッドに投入し、
+        ワーカーの空き待ちと並行して進める。
+        
+        Args:
+            paths_future: (入力HTMLパス, 出力PDFパス) を返すFuture
+            extra_args: この変換だけに適用するオプション
+            timeout: タイムアウト秒数
+            
+        Returns:
+            bool: PDFが生成された場合True
+        """
+        worker = self._idle.get(timeout=timeout)
+        recycle = False
+        try:
+            # 終了済み、または前回の再起動に失敗して空（None）になった枠は起動し直す
+            if worker is None or worker.poll() is not None:
+                worker = None
+                worker = self._spawn()
+            html_path, pdf_path = paths_future.result(timeout=timeout)
+            # 引数行は空白で区切られるため、空白を含むパスは渡せない
+            if any(ch.isspace() for ch in html_path + pdf_path):
+                raise ValueError(f"Temporary file path contains whitespace: {html_path}, {pdf_path}")
+            
+            # ここから先の失敗はワーカー側の問題として扱う
+            recycle = True
+            line = " ".join(list(extra_args) + [html_path, pdf_path]) + "\n"
+            worker.stdin.write(line.encode('utf-8'))
+            worker.stdin.flush()
+            success = self._wait_for_pdf(worker, pdf_path, timeout)
+            recycle = not success
+            return success
+        finally:
+            # 失敗したワーカーは状態が不明なため作り直す
+            if recycle:
+                self._terminate(worker)
+                try:
+                    worker = self._spawn()
+                except OSError:
+                    worker = None
+            # 起動に失敗した場合も空の枠を戻し、プールのサイズを維持する
+            self._idle.put(worker)
+    
+    def _wait_for_pdf(self, worker, pdf_path, timeout):
+        """PDF末尾の%%EOFが書き込まれるまでポーリング"""
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if worker.poll() is not None:
+                return False
+            try:
+                size = os.path.getsize(pdf_path)
+                if size > 0:
+                    with open(pdf_path, 'rb') as pdf_file:
+                        pdf_file.seek(max(size - 1024, 0))
+                        if b'%%EOF' in pdf_file.read():
+                            return True
+            except OSError:
+                pass
+            time.sleep(self.POLL_INTERVAL)
+        return False
+    
+    def _terminate(self, worker):
+        """ワーカープロセスを終了"""
+        try:
+            worker.stdin.close()
+        except Exception:
+            pass
+        try:
+            worker.terminate()
+            worker.wait(timeout=5)
+        except Exception:
+            worker.kill()
+    
+    def close(self):
+        """全ワーカーを終了"""
+        while True:
+            try:
+                worker = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            if worker is not None:
+                self._terminate(worker)
 
 
 class HTMLProcessor:
@@ -31,6 +1007,68 @@ class HTMLProcessor:
     WGET_TIMEOUT = 30
     WGET_TRIES = 2
     MIN_TEXT_LENGTH = 100
+    PDF_TIMEOUT = 120
+    SHM_DIR = "/dev/shm"
+    
+    # 処理済みHTMLの品質判定に使うサイズ閾値（文字数）
+    MIN_VALID_HTML_SIZE = 5000
+    MAX_VALID_HTML_SIZE = 500000
+    FAST_ACCEPT_HTML_SIZE = (50000, 300000)
+    
+    # 正規表現による要素除去を行うHTMLの上限サイズ（文字数）
+    MAX_REGEX_CLEAN_SIZE = 10000000
+    
+    # WordPress整形結果を保持する件数（文書全体を保持するため少数に限定）
+    WP_RENDER_CACHE_SIZE = 4
+    
+    # 画像強化用パーサー（描画に影響しないコメント/PIとID索引を保持せずメモリを削減）
+    _LEAN_HTML_PARSER = html.HTMLParser(remove_comments=True, remove_pis=True, collect_ids=False)
+    
+    # 共通HTTPヘッダー（User-Agentはインスタンスごとに付与）
+    COMMON_HEADERS = {
+        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8',
+        'Accept-Language': 'en-US,en;q=0.9',
+        'Accept-Encoding': 'gzip, deflate, br',
+        'Connection': 'keep-alive',
+        'Referer': 'https://www.google.com/',
+        'Cache-Control': 'max-age=0'
+    }
+    
+    # 高度なブラウザエミュレーション用HTTPヘッダー（User-Agentはインスタンスごとに付与）
+    ADVANCED_HEADERS = {
+        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8,application/signed-exchange;v=b3;q=0.7',
+        'Accept-Language': 'en-US,en;q=0.9,ja;q=0.8',
+        'Accept-Encoding': 'gzip, deflate, br',
+        'Connection': 'keep-alive',
+        'Upgrade-Insecure-Requests': '1',
+        'Sec-Fetch-Dest': 'document',
+        'Sec-Fetch-Mode': 'navigate',
+        'Sec-Fetch-Site': 'none',
+        'Sec-Fetch-User': '?1',
+        'DNT': '1',
+        'Referer': 'https://www.google.com/',
+        'Cache-Control': 'max-age=0',
+        'sec-ch-ua': '"Google Chrome";v="115", "Chromium";v="115", "Not/A)Brand";v="99"',
+        'sec-ch-ua-mobile': '?0',
+        'sec-ch-ua-platform': '"Windows"'
+    }
+    
+    # wkhtmltopdfの共通オプション
+    WKHTMLTOPDF_OPTIONS = (
+        "--quiet",
+        "--page-size", "A4",
+        "--encoding", "UTF-8",
+        "--enable-local-file-access",
+        "--margin-top", "10mm",
+        "--margin-right", "10mm",
+        "--margin-bottom", "15mm",
+        "--margin-left", "10mm",
+        "--disable-javascript",  # JavaScriptは無効化（タイムアウト防止）
+        "--load-error-handling", "ignore",
+        "--load-media-error-handling", "ignore",
+        "--no-stop-slow-scripts",  # 追加: スクリプト実行を中断しない
+        "--disable-smart-shrinking",  # 追加: スマート縮小を無効化（速度向上）
+    )
     
     def __init__(self, user_agent=None, helper=None):
         """
@@ -42,6 +1080,58 @@ class HTMLProcessor:
         """
         self.user_agent = user_agent or self.DEFAULT_USER_AGENT
         self.helper = helper
+        self.debug_mode = False
+        self._pdf_pool = None
+        # fetch_imagesごとのnewspaper設定キャッシュ
+        self._newspaper_configs = {}
+        # 高速抽出で使うメタデータ抽出器（初回使用時に生成）
+        self._metadata_extractor = None
+        # WordPressと判定済みのドメイン（同一サイトの2件目以降は検出処理を省略）
+        self._wp_netlocs = set()
+        # WordPress整形結果のキャッシュ（(長さ, ハッシュ, URL) → 整形済みHTML）
+        self._wp_render_cache = {}
+        # WordPress処理で整形できず元のHTMLを返した回数（フォールバック率の確認用）
+        self._wp_fallback_count = 0
+        # 一時ファイル書き込みなどのI/Oを変換処理と並行させるスレッドプール（ワーカープール使用時のみ）
+        self._io_pool = None
+    
+    def set_debug_mode(self, debug_mode):
+        """デバッグモードを設定"""
+        self.debug_mode = debug_mode
+    
+    def start_pdf_pool(self, wkhtmltopdf_path, size=None):
+        """
+        常駐wkhtmltopdfワーカープールを起動
+        
+        Args:
+            wkhtmltopdf_path: wkhtmltopdfのパス
+            size: ワーカー数 (省略時は min(CPU数, 4))
+            
+        Returns:
+            bool: 起動に成功した場合True
+        """
+        if self._pdf_pool is not None:
+            return True
+        try:
+            self._pdf_pool = _WkPool(wkhtmltopdf_path, self.WKHTMLTOPDF_OPTIONS,
+                                     env=self._prepare_wkhtmltopdf_env(), size=size)
+            self._io_pool = ThreadPoolExecutor(max_workers=2)
+            atexit.register(self.stop_pdf_pool)
+            self.log(f"Started wkhtmltopdf worker pool with {self._pdf_pool.size} workers")
+            return True
+        except Exception as e:
+            self.log(f"Failed to start wkhtmltopdf worker pool: {str(e)}", "warning")
+            self._pdf_pool = None
+            return False
+    
+    def stop_pdf_pool(self):
+        """常駐wkhtmltopdfワーカープールを停止"""
+        if self._pdf_pool is not None:
+            self._pdf_pool.close()
+            self._pdf_pool = None
+        if self._io_pool is not None:
+            self._io_pool.shutdown()
+            self._io_pool = None
     
     def log(self, message, level="info"):
         """
@@ -61,12 +1151,27 @@ class HTMLProcessor:
         else:
             print(message)
     
-    def extract_article(self, url):
+    def _log_traceback(self):
+        """
+        デバッグモード時のみ現在の例外のスタックトレースを出力
+        
+        スタックトレースの整形はフレームを辿るためコストが高く、
+        次の抽出方法にフォールバックするだけの失敗では不要。
+        """
+        if not self.debug_mode:
+            return
+        if self.helper:
+            self.helper.log_error(traceback.format_exc())
+        else:
+            traceback.print_exc()
+    
+    def extract_article(self, url, want_summary=False):
         """
         記事抽出のメイン関数 - 3段階の抽出方法を順に試行
         
         Args:
             url: 記事のURL
+            want_summary: 結果に200文字のサマリーを含めるか
             
         Returns:
             dict: 抽出結果を含む辞書、または失敗時はNone
@@ -86,7 +1191,7 @@ class HTMLProcessor:
                 extract_func = method["method"]
                 
                 self.log(f"[EXTRACTION] ATTEMPT: Using {method_name} method")
-                result = extract_func(url)
+                result = extract_func(url, want_summary)
                 
                 if self._is_valid_result(result):
                     chars = len(result["text"])
@@ -104,10 +1209,7 @@ class HTMLProcessor:
             
         except Exception as e:
             self.log(f"[EXTRACTION] CRITICAL ERROR: {str(e)}", "error")
-            if self.helper:
-                self.helper.log_error(traceback.format_exc())
-            else:
-                traceback.print_exc()
+            self._log_traceback()
             return None
     
     def _is_valid_result(self, result):
@@ -128,6 +1230,9 @@ class HTMLProcessor:
         """
         newspaper3kの設定を取得
         
+        Configの生成はコストが高いため、fetch_imagesごとに1つ生成して使い回し、
+        呼び出しごとに変わるタイムアウトのみ更新する。
+        
         Args:
             timeout: タイムアウト秒数
             fetch_images: 画像取得するかどうか
@@ -135,21 +1240,25 @@ class HTMLProcessor:
         Returns:
             Config: 設定オブジェクト
         """
-        config = Config()
-        config.browser_user_agent = self.user_agent
+        config = self._newspaper_configs.get(fetch_images)
+        if config is None:
+            config = Config()
+            config.browser_user_agent = self.user_agent
+            config.fetch_images = fetch_images
+            config.memoize_articles = True
+            config.headers = self._get_common_headers()
+            self._newspaper_configs[fetch_images] = config
         config.request_timeout = timeout
-        config.fetch_images = fetch_images
-        config.memoize_articles = True
-        config.headers = self._get_common_headers()
         return config
     
-    def _build_article_result(self, article, html_content=None):
+    def _build_article_result(self, article, html_content=None, want_summary=False):
         """
         記事オブジェクトから結果辞書を構築
         
         Args:
             article: newspaperのArticleオブジェクト
             html_content: 元のHTML内容（指定がなければarticle.htmlを使用）
+            want_summary: サマリーを生成するか（Falseの場合はキー自体を省略）
             
         Returns:
             dict: 記事情報を含む辞書
@@ -170,11 +1279,8 @@ class HTMLProcessor:
         # HTMLコンテンツの選択
         html = html_content if html_content is not None else article.html
         
-        # サマリーの生成
-        summary = article.text[:200] + "..." if article.text and len(article.text) > 200 else article.text
-        
         # 結果辞書を構築
-        return {
+        result = {
             "title": article.title,
             "text": article.text,
             "html": html,
@@ -183,16 +1289,145 @@ class HTMLProcessor:
             "top_image": article.top_image,
             "images": images,
             "keywords": article.keywords if hasattr(article, 'keywords') else [],
-            "summary": summary,
             "error": None
         }
+        
+        # サマリーの生成（要求された場合のみ）
+        if want_summary:
+            result["summary"] = self._make_summary(article.text)
+        
+        return result
+    
+    def _make_summary(self, text):
+        """
+        本文から200文字のサマリーを生成
+        
+        Args:
+            text: 記事本文
+            
+        Returns:
+            str: サマリー
+        """
+        return text[:200] + "..." if text and len(text) > 200 else text
+    
+    def _fast_lxml_extract(self, url, html_content, want_summary=False):
+        """
+        readability-lxmlによる高速な記事抽出（newspaperのパース処理を省略）
+        
+        Args:
+            url: 記事のURL
+            html_content: 取得済みのHTML内容
+            want_summary: サマリーを生成するか
+            
+        Returns:
+            dict: 記事情報を含む辞書、本文が短すぎる場合や失敗時はNone
+        """
+        try:
+            # 1回だけ解析し、readabilityが本文抽出でツリーを書き換える前にメタデータを取得
+            page_doc, _ = build_doc(html_content)
+            metadata = self._extract_metadata(url, page_doc)
+            
+            doc = Document(page_doc)
+            summary_doc = html.fromstring(doc.summary())
+            
+            # 段落単位でテキストを構築（newspaperと同じく空行区切り）
+            # 収集対象の要素内にある要素は外側の要素に含まれるため重複して数えない
+            paragraphs = []
+            for element in summary_doc.iter(*_TEXT_BLOCK_TAGS):
+                if next(element.iterancestors(*_TEXT_BLOCK_TAGS), None) is not None:
+                    continue
+                paragraph = element.text_content().strip()
+                if paragraph:
+                    paragraphs.append(paragraph)
+            text = "\n\n".join(paragraphs) if paragraphs else summary_doc.text_content().strip()
+            
+            if len(text) <= self.MIN_TEXT_LENGTH:
+                return None
+            
+            title, authors, publish_date, meta_image = metadata
+            
+            # 画像URLを絶対URLに変換して収集
+            images = []
+            for src in _IMG_SRC_XPATH(summary_doc):
+                img_url = urljoin(url, src) if url else src
+                if img_url not in images:
+                    images.append(img_url)
+            
+            result = {
+                "title": title or doc.short_title(),
+                "text": text,
+                "html": html_content,
+                "authors": authors,
+                "publish_date": publish_date,
+                "top_image": meta_image or (images[0] if images else None),
+                "images": images,
+                "keywords": [],
+                "error": None
+            }
+            if want_summary:
+                result["summary"] = self._make_summary(text)
+            return result
+            
+        except Exception as e:
+            self.log(f"Fast lxml extraction failed: {str(e)}", "warning")
+            return None
+    
+    def _get_metadata_extractor(self):
+        """
+        メタデータ抽出用のnewspaper抽出器を取得（初回のみ生成）
+        
+        記事取得用のConfigはタイムアウトを呼び出しごとに書き換えるため共有せず、専用のConfigを使う。
+        
+        Returns:
+            ContentExtractor: メタデータ抽出器
+        """
+        if self._metadata_extractor is None:
+            self._metadata_extractor = ContentExtractor(Config())
+        return self._metadata_extractor
+    
+    def _extract_metadata(self, url, page_doc):
+        """
+        newspaperのメタデータ抽出器でタイトル・著者・公開日・代表画像を取得
+        
+        本文抽出やDOMクリーニングは行わず、解析済みのツリーからメタデータのみを読み取る。
+        
+        Args:
+            url: 記事のURL
+            page_doc: 解析済みのページ全体のツリー
+            
+        Returns:
+            tuple: (タイトル, 著者リスト, 公開日文字列, 代表画像URL)、取得できない項目は空またはNone
+        """
+        extractor = self._get_metadata_extractor()
+        config = extractor.config
+        
+        title = extractor.get_title(page_doc)[:config.MAX_TITLE]
+        authors = extractor.get_authors(page_doc)[:config.MAX_AUTHORS]
+        
+        # 日付フォーマット（_build_article_resultと同じ形式）
+        publish_date = None
+        date = extractor.get_publishing_date(url, page_doc)
+        if date:
+            try:
+                publish_date = date.strftime('%Y-%m-%d')
+            except ValueError:
+                pass
+        
+        # 代表画像はnewspaperと同じくOGP/Twitterカードのメタ情報を優先
+        meta_image = (extractor.get_meta_content(page_doc, 'meta[property="og:image"]')
+                      or extractor.get_meta_content(page_doc, 'meta[name="twitter:image"]'))
+        if meta_image and url:
+            meta_image = urljoin(url, meta_image)
+        
+        return title, authors, publish_date, meta_image or None
     
-    def _extract_standard(self, url):
+    def _extract_standard(self, url, want_summary=False):
         """
         標準的な記事抽出メソッド - newspaper3kの基本機能を使用
         
         Args:
             url: 記事のURL
+            want_summary: 結果にサマリーを含めるか
             
         Returns:
             dict: 抽出結果を含む辞書、または失敗時はエラー情報
@@ -229,7 +1464,7 @@ class HTMLProcessor:
                 if article.top_image:
                     self.log(f"[STANDARD] Top image: {article.top_image}")
                 
-                return self._build_article_result(article)
+                return self._build_article_result(article, want_summary=want_summary)
                 
             except newspaper.article.ArticleException as e:
                 self.log(f"[STANDARD] Newspaper exception: {str(e)}")
@@ -240,18 +1475,16 @@ class HTMLProcessor:
                 
         except Exception as e:
             self.log(f"[STANDARD] Error in standard extraction: {str(e)}", "error")
-            if self.helper:
-                self.helper.log_error(traceback.format_exc())
-            else:
-                traceback.print_exc()
+            self._log_traceback()
             return {"error": str(e), "text": None}
     
-    def _extract_direct(self, url):
+    def _extract_direct(self, url, want_summary=False):
         """
         wgetを使用した直接記事抽出 + newspaperパース
         
         Args:
             url: 記事のURL
+            want_summary: 結果にサマリーを含めるか
             
         Returns:
             dict: 抽出結果を含む辞書、または失敗時はエラー情報
@@ -299,6 +1532,13 @@ class HTMLProcessor:
             with open(temp_path, 'r', encoding='utf-8', errors='replace') as f:
                 html_content = f.read()
             
+            # まずlxmlベースの高速抽出を試行
+            fast_result = self._fast_lxml_extract(url, html_content, want_summary)
+            if fast_result:
+                self._cleanup_temp_file(temp_path)
+                self.log(f"[DIRECT] Fast lxml extraction succeeded: {len(fast_result['text'])} chars")
+                return fast_result
+            
             # newspaper3kのパーサーを使用してコンテンツを解析
             config = self._get_newspaper_config(fetch_images=True)
             article = Article('', config=config)  # URLは空でOK
@@ -328,27 +1568,25 @@ class HTMLProcessor:
             # テキスト抽出の結果を確認
             if article.text and len(article.text.strip()) > self.MIN_TEXT_LENGTH:
                 self.log(f"[DIRECT] Successfully extracted {len(article.text)} chars")
-                return self._build_article_result(article, html_content)
+                return self._build_article_result(article, html_content, want_summary)
             else:
                 self.log(f"[DIRECT] Parsing succeeded but insufficient text: {len(article.text if article.text else '')} chars")
                 return {"error": "Insufficient text content", "text": article.text}
             
         except Exception as e:
             self.log(f"[DIRECT] Error: {str(e)}", "error")
-            if self.helper:
-                self.helper.log_error(traceback.format_exc())
-            else:
-                traceback.print_exc()
+            self._log_traceback()
             # 一時ファイルを確実に削除
             self._cleanup_temp_file(temp_path)
             return {"error": str(e), "text": None}
     
-    def _extract_advanced(self, url):
+    def _extract_advanced(self, url, want_summary=False):
         """
         高度な記事抽出メソッド - 高度なブラウザエミュレーション
         
         Args:
             url: 記事のURL
+            want_summary: 結果にサマリーを含めるか
             
         Returns:
             dict: 抽出結果を含む辞書、または失敗時はエラー情報
@@ -417,8 +1655,15 @@ class HTMLProcessor:
             # さらに待機して自然なページ読み込みをエミュレート
             time.sleep(random.uniform(1.0, 2.0))
             
-            # 取得したHTMLでArticleオブジェクトを手動で設定
             self.log(f"[ADVANCED] Retrieved HTML size: {len(response.text)} bytes")
+            
+            # まずlxmlベースの高速抽出を試行
+            fast_result = self._fast_lxml_extract(url, response.text, want_summary)
+            if fast_result:
+                self.log(f"[ADVANCED] Fast lxml extraction succeeded: {len(fast_result['text'])} chars")
+                return fast_result
+            
+            # 取得したHTMLでArticleオブジェクトを手動で設定
             self.log("[ADVANCED] Parsing content with newspaper")
             
             article = Article(url, config=config)
@@ -446,17 +1691,14 @@ class HTMLProcessor:
                 self.log(f"[ADVANCED] Successfully extracted article: {len(article.text)} chars")
                 self.log(f"[ADVANCED] Title: {article.title}")
                 
-                return self._build_article_result(article)
+                return self._build_article_result(article, want_summary=want_summary)
             else:
                 self.log("[ADVANCED] Article parsing succeeded but no meaningful text was extracted")
                 return {"error": "No meaningful text in the article", "text": article.text if article.text else None}
             
         except Exception as e:
             self.log(f"[ADVANCED] Error in advanced extraction: {str(e)}", "error")
-            if self.helper:
-                self.helper.log_error(traceback.format_exc())
-            else:
-                traceback.print_exc()
+            self._log_traceback()
             return {"error": str(e), "text": None}
 
     def convert_html_to_pdf(self, html_content, wkhtmltopdf_path, url="", 
@@ -477,9 +1719,6 @@ class HTMLProcessor:
         Returns:
             bytes: PDF内容、または失敗時はNone
         """
-        temp_html_path = None
-        pdf_path = None
-        
         try:
             # デバッグ出力
             self.log("Starting enhanced PDF conversion process")
@@ -521,13 +1760,11 @@ class HTMLProcessor:
                 else:
                     # 抽出に失敗した場合は選択的クリーニングにフォールバック
                     self.log("Extraction failed, falling back to selective cleaning")
-                    cleaned_html = self._selective_layout_cleaning(html_content)
-                    cleaned_html = self._prepare_html_for_better_layout(cleaned_html, url, include_images)
+                    cleaned_html = self._clean_and_prepare_layout(html_content, url, include_images)
             else:  # "minimal" 戦略
                 # minimal戦略 - レイアウトを保持しながら問題要素を除去
                 self.log("Using 'minimal' strategy - preserving layout with selective cleaning")
-                cleaned_html = self._selective_layout_cleaning(html_content)
-                cleaned_html = self._prepare_html_for_better_layout(cleaned_html, url, include_images)
+                cleaned_html = self._clean_and_prepare_layout(html_content, url, include_images)
                 
                 # 結果の品質をチェック
                 if not self._is_valid_processed_html(cleaned_html):
@@ -547,44 +1784,21 @@ class HTMLProcessor:
             if '</head>' in cleaned_html:
                 cleaned_html = cleaned_html.replace('</head>', f'{self._get_layout_repair_css()}</head>')
             
-            # 専用のランタイムディレクトリを作成（権限問題解決）
-            try:
-                runtime_dir = "/tmp/runtime-pdf"
-                os.makedirs(runtime_dir, mode=0o700, exist_ok=True)
-                os.environ['XDG_RUNTIME_DIR'] = runtime_dir
-                self.log(f"Set XDG_RUNTIME_DIR to {runtime_dir}")
-            except Exception as runtime_error:
-                self.log(f"Failed to create runtime directory: {str(runtime_error)}", "warning")
-                # Qtのエラーを抑制
-                os.environ['QT_LOGGING_RULES'] = "qt.qpa.xcb=false;*.debug=false"
-            
-            # 一時ファイルを使用してPDFを生成
+            # 常駐ワーカープールが有効な場合はプールで変換
+            if self._pdf_pool is not None:
+                pdf_content = self._convert_with_pool(cleaned_html, include_images)
+                if pdf_content:
+                    return pdf_content
+                self.log("Worker pool conversion failed, falling back to direct wkhtmltopdf call", "warning")
+            
+            # 環境変数を準備
+            env = self._prepare_wkhtmltopdf_env()
+            
+            # HTMLを標準入力から渡し、PDFを標準出力から受け取る（一時ファイル不要）
             try:
-                with tempfile.NamedTemporaryFile(suffix='.html', delete=False) as temp_html:
-                    temp_html.write(cleaned_html.encode('utf-8'))
-                    temp_html_path = temp_html.name
-                
-                pdf_path = tempfile.NamedTemporaryFile(suffix='.pdf', delete=False).name
-                
-                self.log(f"Using temporary files: HTML={temp_html_path}, PDF={pdf_path}")
-                
                 # 最適化されたオプション設定
-                cmd = [
-                    wkhtmltopdf_path,
-                    "--quiet",
-                    "--page-size", "A4",
-                    "--encoding", "UTF-8",
-                    "--enable-local-file-access",
-                    "--margin-top", "10mm",
-                    "--margin-right", "10mm", 
-                    "--margin-bottom", "15mm",
-                    "--margin-left", "10mm",
-                    "--disable-javascript",  # JavaScriptは無効化（タイムアウト防止）
-                    "--load-error-handling", "ignore",
-                    "--load-media-error-handling", "ignore",
-                    "--no-stop-slow-scripts",  # 追加: スクリプト実行を中断しない
-                    "--disable-smart-shrinking",  # 追加: スマート縮小を無効化（速度向上）
-                ]
+                cmd = [wkhtmltopdf_path]
+                cmd.extend(self.WKHTMLTOPDF_OPTIONS)
                 
                 # 画像設定
                 if include_images:
@@ -592,64 +1806,140 @@ class HTMLProcessor:
                 else:
                     cmd.append("--no-images")
                 
-                # 入出力ファイルパスの追加
-                cmd.extend([temp_html_path, pdf_path])
+                # 入出力に標準入出力を指定
+                cmd.extend(["-", "-"])
                 
                 self.log(f"Executing command: {' '.join(cmd)}")
                 
-                # 環境変数を準備
-                env = os.environ.copy()
-                env['QT_LOGGING_RULES'] = "qt.qpa.xcb=false;*.debug=false"
-                
-                # タイムアウト設定
-                timeout_seconds = 120  # 40秒から120秒に延長
-                
                 # コマンド実行
                 process = subprocess.run(
                     cmd,
+                    input=cleaned_html.encode('utf-8'),
                     capture_output=True,
-                    text=True,
-                    timeout=timeout_seconds,
+                    timeout=self.PDF_TIMEOUT,
                     env=env
                 )
                 
                 self.log(f"Command exit code: {process.returncode}")
-                if process.stdout:
-                    self.log(f"Command stdout: {process.stdout[:500]}")
                 if process.stderr:
-                    self.log(f"Command stderr: {process.stderr[:500]}", "warning")
+                    self.log(f"Command stderr: {process.stderr[:500].decode('utf-8', errors='replace')}", "warning")
                 
                 if process.returncode != 0:
                     self.log(f"wkhtmltopdf command failed with code {process.returncode}", "error")
                     return None
                 
-                # PDFファイルを読み込む
-                if os.path.exists(pdf_path) and os.path.getsize(pdf_path) > 0:
-                    with open(pdf_path, 'rb') as pdf_file:
-                        pdf_content = pdf_file.read()
-                    
+                pdf_content = process.stdout
+                if pdf_content:
                     self.log(f"Successfully generated PDF, size: {len(pdf_content)} bytes")
                     return pdf_content
                 else:
-                    self.log(f"PDF file not created or empty", "error")
+                    self.log(f"PDF output is empty", "error")
                     return None
                     
             except subprocess.TimeoutExpired as timeout_error:
                 self.log(f"PDF conversion timed out: {str(timeout_error)}", "error")
                 return None
-                
-            except Exception as temp_file_error:
-                self.log(f"Error with temp files: {str(temp_file_error)}", "error")
-                return None
             
         except Exception as e:
             self.log(f"Error converting HTML to PDF: {str(e)}", "error")
-            traceback.print_exc()
+            self._log_traceback()
+            return None
+
+    def _prepare_wkhtmltopdf_env(self):
+        """
+        wkhtmltopdf実行用の環境変数を準備
+        
+        Returns:
+            dict: 環境変数辞書
+        """
+        # 専用のランタイムディレクトリを作成（権限問題解決）
+        try:
+            runtime_dir = "/tmp/runtime-pdf"
+            os.makedirs(runtime_dir, mode=0o700, exist_ok=True)
+            os.environ['XDG_RUNTIME_DIR'] = runtime_dir
+            self.log(f"Set XDG_RUNTIME_DIR to {runtime_dir}")
+        except Exception as runtime_error:
+            self.log(f"Failed to create runtime directory: {str(runtime_error)}", "warning")
+            # Qtのエラーを抑制
+            os.environ['QT_LOGGING_RULES'] = "qt.qpa.xcb=false;*.debug=false"
+        
+        env = os.environ.copy()
+        env['QT_LOGGING_RULES'] = "qt.qpa.xcb=false;*.debug=false"
+        return env
+
+    def _get_memory_temp_dir(self):
+        """
+        メモリ上（tmpfs）の一時ディレクトリを取得
+        
+        Returns:
+            str: /dev/shmが利用可能な場合はそのパス、それ以外はNone（/tmpを使用）
+        """
+        if os.path.isdir(self.SHM_DIR) and os.access(self.SHM_DIR, os.W_OK):
+            return self.SHM_DIR
+        return None
+
+    def _convert_with_pool(self, cleaned_html, include_images):
+        """
+        常駐ワーカープールでHTMLをPDFに変換
+        
+        Args:
+            cleaned_html: 処理済みHTML
+            include_images: 画像を含めるか
+            
+        Returns:
+            bytes: PDF内容、または失敗時はNone
+        """
+        # 一時ファイルの書き込みをI/Oスレッドに投入し、ワーカーの空き待ちと重ねる
+        temp_files = self._io_pool.submit(self._write_pool_temp_files, cleaned_html)
+        try:
+            image_option = "--images" if include_images else "--no-images"
+            
+            if not self._pdf_pool.convert(temp_files, [image_option], timeout=self.PDF_TIMEOUT):
+                return None
+            
+            temp_html_path, pdf_path = temp_files.result()
+            self.log(f"Converted via worker pool: HTML={temp_html_path}, PDF={pdf_path}")
+            
+            with open(pdf_path, 'rb') as pdf_file:
+                pdf_content = pdf_file.read()
+            
+            self.log(f"Successfully generated PDF via worker pool, size: {len(pdf_content)} bytes")
+            return pdf_content
+            
+        except Exception as e:
+            self.log(f"Error in worker pool conversion: {str(e)}", "warning")
             return None
         
         finally:
-            # 一時ファイルを確実に削除
-            self._cleanup_temp_files([temp_html_path, pdf_path])
+            try:
+                self._cleanup_temp_files(temp_files.result())
+            except Exception:
+                pass
+
+    def _write_pool_temp_files(self, cleaned_html):
+        """
+        ワーカープール用の入力HTMLと出力PDFの一時ファイルを作成（I/Oスレッドで実行）
+        
+        Args:
+            cleaned_html: 処理済みHTML
+            
+        Returns:
+            tuple: (入力HTMLパス, 出力PDFパス)
+        """
+        # ディスクに書き込まないようtmpfs上に一時ファイルを作成
+        temp_dir = self._get_memory_temp_dir()
+        with tempfile.NamedTemporaryFile(suffix='.html', delete=False, dir=temp_dir) as temp_html:
+            temp_html.write(cleaned_html.encode('utf-8'))
+            temp_html_path = temp_html.name
+        
+        try:
+            with tempfile.NamedTemporaryFile(suffix='.pdf', delete=False, dir=temp_dir) as temp_pdf:
+                pdf_path = temp_pdf.name
+        except Exception:
+            self._cleanup_temp_file(temp_html_path)
+            raise
+        
+        return temp_html_path, pdf_path
 
     def _determine_best_strategy(self, html_content, url):
         """
@@ -667,21 +1957,21 @@ class HTMLProcessor:
             self.log("WordPress site detected - using extract strategy")
             return "extract"
         
+        div_count, script_count, section_count, article_count = _count_layout_tags(html_content)
+        
         # 複雑なレイアウトの特徴を検出
         has_complex_layout = (
-            re.search(r'display\s*:\s*grid', html_content) or
-            re.search(r'display\s*:\s*flex', html_content) or
-            len(re.findall(r'<div', html_content)) > 100 or
-            len(re.findall(r'<script', html_content)) > 15
+            _DISPLAY_GRID_RE.search(html_content) or
+            _DISPLAY_FLEX_RE.search(html_content) or
+            div_count > 100 or
+            script_count > 15
         )
         
         # 多階層のネストされた構造をチェック
         nested_level = 0
-        for tag in ['div', 'section', 'article']:
-            pattern = f'<{tag}[^>]*>'
-            matches = re.findall(pattern, html_content)
+        for tag_count in (div_count, section_count, article_count):
             # 非常に多くのネストがある場合
-            if len(matches) > 50:
+            if tag_count > 50:
                 nested_level += 1
         
         # 特定のサイトパターンをチェック
@@ -711,23 +2001,54 @@ class HTMLProcessor:
         Returns:
             bool: 有効な場合True
         """
-        # 1. テキスト/HTMLの比率が低すぎないか
-        text_ratio = len(re.findall(r'[a-zA-Z0-9]', html_content)) / max(len(html_content), 1)
-        if text_ratio < 0.05:  # テキスト率が5%未満
+        # 1. サイズによる早期判定
+        html_size = len(html_content)
+        if html_size > self.MAX_VALID_HTML_SIZE:  # 巨大なHTMLは問題の兆候
             return False
+        if html_size < self.MIN_VALID_HTML_SIZE:  # ほぼ空のHTML
+            return False
+        
+        # 2. 一般的なサイズのHTMLはテキスト比率のみを確認し、本文コンテナの探索を省略
+        #    （lxmlでシリアライズしたHTMLは常に<html>で始まるため、先頭タグは判定材料にならない）
+        if self.FAST_ACCEPT_HTML_SIZE[0] <= html_size <= self.FAST_ACCEPT_HTML_SIZE[1]:
+            return self._has_enough_text(html_content)
         
-        # 2. 本文コンテンツが含まれているか
-        content_containers = ['<article', '<div class="content"', '<div class="article"', '<main']
-        has_content = any(container in html_content for container in content_containers)
-        if not has_content:
+        return self._analyze_processed_html(html_content)
+    
+    def _analyze_processed_html(self, html_content):
+        """
+        テキスト比率と本文コンテナの有無によるHTML品質の詳細解析
+        
+        Args:
+            html_content: 処理済みのHTML
+            
+        Returns:
+            bool: 有効な場合True
+        """
+        # テキスト/HTMLの比率が低すぎないか
+        if not self._has_enough_text(html_content):
             return False
         
-        # 3. ページが極端に大きくないか（巨大なHTMLは問題の兆候）
-        if len(html_content) > 500000:  # 500KB以上
+        # 本文コンテンツが含まれているか
+        if not _CONTENT_MARKERS.search(html_content):
             return False
         
         return True
     
+    def _has_enough_text(self, html_content):
+        """
+        テキスト/HTMLの比率が十分かを確認
+        
+        Args:
+            html_content: 処理済みのHTML
+            
+        Returns:
+            bool: テキスト率が5%以上の場合True
+        """
+        alnum_count = _count_alnum(html_content)
+        text_ratio = alnum_count / max(len(html_content), 1)
+        return text_ratio >= 0.05
+    
     def _enhance_content_images(self, html_content):
         """
         記事関連の画像を識別して強化
@@ -740,45 +2061,26 @@ class HTMLProcessor:
         """
         try:
             # lxmlを使用してDOMを解析
-            doc = html.document_fromstring(html_content)
-            
-            # メインコンテンツエリアを特定するセレクタ
-            content_selectors = [
-                'article', '.article', '.content', 'main', '.main', '.post', 
-                '.entry', '[itemprop="articleBody"]', '.story'
-            ]
+            doc = html.document_fromstring(html_content, parser=self._LEAN_HTML_PARSER)
             
-            # コンテンツエリアを検索
-            content_elements = []
-            for selector in content_selectors:
-                try:
-                    elements = doc.cssselect(selector)
-                    if elements:
-                        content_elements.extend(elements)
-                except Exception:
+            # コンテンツエリア内の画像を保護（入れ子のエリアに含まれる画像も1回だけ処理）
+            for img in _CONTENT_IMG_SELECTOR(doc):
+                # 小さすぎる画像やアイコンは除外
+                width = img.get('width')
+                if width and width.isdigit() and int(width) < 50:
+                    continue
+                    
+                # 広告っぽい画像は除外
+                if _AD_IMG_RE.search(img.get('class', '')) or _AD_IMG_RE.search(img.get('src', '')):
                     continue
                 
-            # コンテンツエリア内の画像を保護
-            if content_elements:
-                for element in content_elements:
-                    try:
-                        for img in element.cssselect('img'):
-                            # 小さすぎる画像やアイコンは除外
-                            width = img.get('width')
-                            if width and width.isdigit() and int(width) < 50:
-                                continue
-                                
-                            # 広告っぽい画像は除外
-                            img_class = img.get('class', '').lower()
-                            img_src = img.get('src', '').lower()
-                            if any(term in img_class or term in img_src for term in ['ad', 'banner', 'icon', 'logo']):
-                                continue
-                            
-                            # コンテンツ画像として保護
-                            img.set('class', (img.get('class', '') + ' content-image-preserve').strip())
-                            img.set('style', (img.get('style', '') + '; max-width: 100% !important; height: auto !important;').strip())
-                    except Exception:
-                        continue
+                # コンテンツ画像として保護
+                img.classes.add('content-image-preserve')
+                style = img.get('style')
+                if not style:
+                    img.set('style', _IMG_PRESERVE_STYLE)
+                elif _IMG_PRESERVE_STYLE not in style:
+                    img.set('style', f'{style}; {_IMG_PRESERVE_STYLE}')
             
             # 変更後のHTMLを返す
             return html.tostring(doc).decode('utf-8')
@@ -789,9 +2091,38 @@ class HTMLProcessor:
         # エラー時は元のHTMLを返す
         return html_content
     
-    def _selective_layout_cleaning(self, html_content):
+    def _clean_layout_tree(self, doc):
+        """
+        解析済みドキュメントから問題要素を除去（ドキュメントを直接変更）
+        
+        Args:
+            doc: _parse_onceで解析したルート要素
+        """
+        # 1. 広告・サイドバー・ソーシャル要素を構造的に除去（入れ子のdivも丸ごと除去）
+        for element in _LAYOUT_REMOVE_XPATH(doc):
+            if element.getparent() is not None:
+                element.drop_tree()
+        
+        # 2. スクリプトを除去
+        _SCRIPT_CLEANER(doc)
+        
+        # 3. スタイルシートのグリッド/フレックスレイアウトを調整
+        for style in doc.iter('style'):
+            if style.text:
+                style.text = _LAYOUT_FIX_RE.sub(_layout_fix_replacement, style.text)
+        
+        # 4. インラインスタイルの調整とJavaScriptイベント属性の除去（1回の走査）
+        for element in doc.iter(etree.Element):
+            attrib = element.attrib
+            for name in [name for name in attrib if name.startswith('on')]:
+                del attrib[name]
+            style = attrib.get('style')
+            if style and ('grid' in style or 'flex' in style or 'fixed' in style or 'sticky' in style):
+                attrib['style'] = _LAYOUT_FIX_RE.sub(_layout_fix_replacement, style)
+    
+    def _selective_layout_cleaning_regex(self, html_content):
         """
-        レイアウトをなるべく維持しながら問題要素を除去
+        正規表現による選択的クリーニング（lxmlで解析できないHTML用）
         
         Args:
             html_content: 元のHTML
@@ -799,44 +2130,151 @@ class HTMLProcessor:
         Returns:
             str: クリーニング済みのHTML
         """
-        # 1. 最も問題のある要素を選択的に除去
-        patterns_to_remove = [
-            # 広告関連
-            (r'<div[^>]*(?:ad|advertisement|banner|sponsor|promo)[^>]*>.*?</div>', ''),
-            (r'<aside[^>]*>.*?</aside>', ''),  # サイドバー要素
-            # ソーシャルボタン、関連記事
-            (r'<div[^>]*(?:social|share|related|recommend)[^>]*>.*?</div>', ''),
-            # iframe（動画埋め込みを除く）
-            (r'<iframe[^>]*(?:ad|advertisement|banner)[^>]*>.*?</iframe>', ''),
-        ]
-        
-        for pattern, replacement in patterns_to_remove:
-            html_content = re.sub(pattern, replacement, html_content, flags=re.DOTALL | re.IGNORECASE)
-        
-        # 2. グリッド/フレックスレイアウトを調整
-        layout_fixes = [
-            (r'display\s*:\s*grid[^;]*;', 'display: block;'),
-            (r'display\s*:\s*flex[^;]*;', 'display: block;'),
-            (r'position\s*:\s*fixed[^;]*;', 'position: static;'),
-            (r'position\s*:\s*sticky[^;]*;', 'position: static;'),
-        ]
-        
-        for pattern, replacement in layout_fixes:
-            html_content = re.sub(pattern, replacement, html_content)
-        
-        # 3. インラインスクリプトを削除
-        html_content = re.sub(r'<script\b[^<]*(?:(?!<\/script>)<[^<]*)*<\/script>', '', html_content, flags=re.DOTALL)
-        
-        # 4. オンロードハンドラなどのJavaScriptイベントを削除
-        js_events = ['onclick', 'onload', 'onscroll', 'onmouseover', 'onmouseout']
-        for event in js_events:
-            html_content = re.sub(f' {event}="[^"]*"', '', html_content)
+        # 1. スクリプトと広告iframeを除去
+        html_content = _strip_elements(html_content, 'script')
+        html_content = _strip_elements(html_content, 'iframe', _AD_IFRAME_KEYWORDS)
+        
+        # 2. 広告・サイドバー・ソーシャル要素、JavaScriptイベントを1回の走査で除去
+        #    （極端に大きなHTMLでは最悪時間を抑えるため省略）
+        if len(html_content) <= self.MAX_REGEX_CLEAN_SIZE:
+            html_content = _LAYOUT_CLEAN_RE.sub('', html_content)
+        else:
+            self.log(f"Skipping regex element removal for oversized HTML ({len(html_content)} chars)", "warning")
+        
+        # 3. グリッド/フレックスレイアウトを調整
+        html_content = _LAYOUT_FIX_RE.sub(_layout_fix_replacement, html_content)
         
         return html_content
     
-    def _prepare_html_for_better_layout(self, html_content, url="", include_images=True):
+    def _parse_once(self, html_content):
+        """
+        HTMLをlxmlのドキュメントとして1回だけ解析
+        
+        構造的な編集はこのドキュメントに対して行い、最後に1回だけシリアライズする。
+        
+        Args:
+            html_content: HTML内容
+            
+        Returns:
+            HtmlElement: ルート要素（head/bodyを必ず含む）
+        """
+        return html.document_fromstring(html_content, ensure_head_body=True)
+    
+    def _serialize_document(self, doc, html_content):
+        """
+        _parse_onceで解析したドキュメントを文字列に戻す
+        
+        Args:
+            doc: ルート要素
+            html_content: 解析元のHTML（DOCTYPE宣言の有無の判定に使用）
+            
+        Returns:
+            str: HTML文字列
+        """
+        # 元のHTMLにDOCTYPE宣言がある場合のみ出力（レンダリングモードを維持）
+        if html_content.lstrip()[:9].lower() == '<!doctype':
+            return html.tostring(doc.getroottree(), encoding='unicode')
+        return html.tostring(doc, encoding='unicode')
+    
+    def _clean_and_prepare_layout(self, html_content, url="", include_images=True):
+        """
+        選択的クリーニングとレイアウト前処理を1回の解析・シリアライズで実行
+        
+        Args:
+            html_content: 元のHTML文字列
+            url: 元のURL
+            include_images: 画像を含めるかどうか
+            
+        Returns:
+            str: 処理済みHTML
+        """
+        if not html_content:
+            return html_content
+        
+        try:
+            doc = self._parse_once(html_content)
+        except (etree.ParserError, ValueError) as e:
+            self.log(f"Falling back to string-based layout processing: {str(e)}", "warning")
+            cleaned_html = self._selective_layout_cleaning_regex(html_content)
+            return self._prepare_html_for_better_layout_string(cleaned_html, url, include_images)
+        
+        self._clean_layout_tree(doc)
+        self._prepare_layout_tree(doc, url)
+        return self._serialize_prepared_document(doc, html_content)
+    
+    def _prepare_layout_tree(self, doc, url=""):
+        """
+        解析済みドキュメントにPDF出力用の要素を追加（ドキュメントを直接変更）
+        
+        Args:
+            doc: _parse_onceで解析したルート要素
+            url: 元のURL
+        """
+        # スクリプトを選択的に削除（問題のあるJavaScriptのみを削除）
+        # 問題のあるiframeのみを削除
+        for tag, keywords in (('script', _PROBLEMATIC_SCRIPT_KEYWORDS), ('iframe', _PROBLEMATIC_IFRAME_KEYWORDS)):
+            for element in list(doc.iter(tag)):
+                tag_text = ' '.join(f'{name}="{value}"' for name, value in element.attrib.items()).lower()
+                if _contains_any(tag_text, keywords) and element.getparent() is not None:
+                    element.drop_tree()
+        
+        # head要素を補完（文字コード、ビューポート、タイトル、ベースURL）
+        head = doc.head
+        head_prefix = []
+        # 変換時は常にUTF-8で渡すため、既存の文字コード宣言もUTF-8に揃える
+        # 文字コード宣言はheadの先頭に置き、補完する要素はその直後に挿入する
+        charset_meta = head.find('meta[@charset]')
+        if charset_meta is None:
+            charset_meta = etree.Element('meta', charset='UTF-8')
+        else:
+            charset_meta.set('charset', 'UTF-8')
+        head.insert(0, charset_meta)
+        for meta in head.iterfind('meta[@http-equiv]'):
+            if meta.get('http-equiv').lower() == 'content-type':
+                meta.set('content', 'text/html; charset=UTF-8')
+        if head.find('meta[@name="viewport"]') is None:
+            head_prefix.append(etree.Element(
+                'meta', name='viewport', content='width=device-width, initial-scale=1.0'
+            ))
+        if head.find('title') is None:
+            title = etree.Element('title')
+            title.text = f'Article from {url}' if url else 'Article'
+            head_prefix.append(title)
+        if url and doc.find('.//base') is None:
+            base_url_tag = _base_url_tag(url)
+            if base_url_tag:
+                head_prefix.append(html.fragment_fromstring(base_url_tag))
+        head[1:1] = head_prefix
+        
+        # PDF出力最適化用のCSS
+        head.append(copy.deepcopy(_PDF_STYLE_ELEMENT))
+        
+        # URLフッターを追加
+        if url:
+            footer = etree.SubElement(doc.body, 'div', {'class': 'pdf-footer'})
+            footer.text = f'Source: {url}'
+    
+    def _serialize_prepared_document(self, doc, html_content):
         """
-        レイアウト保持を強化したHTML前処理
+        レイアウト前処理済みのドキュメントを文字列に戻す
+        
+        元がHTML断片（<html>タグなし）の場合は標準モードで描画されるよう
+        DOCTYPE宣言を付与する。
+        
+        Args:
+            doc: ルート要素
+            html_content: 解析元のHTML
+            
+        Returns:
+            str: HTML文字列
+        """
+        if '<html' not in html_content and '<HTML' not in html_content:
+            return "<!DOCTYPE html>\n" + html.tostring(doc, encoding='unicode')
+        return self._serialize_document(doc, html_content)
+    
+    def _prepare_html_for_better_layout_string(self, html_content, url="", include_images=True):
+        """
+        文字列操作によるレイアウト前処理（lxmlで解析できないHTML用）
         
         Args:
             html_content: 元のHTML文字列
@@ -850,156 +2288,102 @@ class HTMLProcessor:
             if not html_content:
                 return html_content
                 
-            # 安全なHTML構造を確保
-            has_html_tag = re.search(r'<html.*?>.*?</html>', html_content, re.DOTALL) is not None
-            has_head_tag = '<head>' in html_content and '</head>' in html_content
-            has_body_tag = '<body' in html_content and '</body>' in html_content
-            
             # ベースURLの設定（相対パスの解決に必要）
-            base_url_tag = ""
-            if url:
-                try:
-                    parsed_url = urlparse(url)
-                    base_url = f"{parsed_url.scheme}://{parsed_url.netloc}"
-                    base_url_tag = f'<base href="{base_url}/">'
-                except:
-                    pass
-            
-            # PDF出力最適化用のCSS - レイアウト保持強化版
-            pdf_css = """
-            <style>
-                @page {
-                    size: A4;
-                    margin: 10mm 10mm 15mm 10mm;
-                }
-                
-                /* リンクのスタイル保持 */
-                a {
-                    color: inherit;
-                    text-decoration: inherit;
-                }
-                
-                /* 画像の適切な拡大縮小 */
-                img {
-                    max-width: 100%;
-                    height: auto;
-                    page-break-inside: avoid;
-                }
-                
-                /* 改ページコントロール */
-                h1, h2, h3, h4, h5, h6 {
-                    page-break-after: avoid;
-                    page-break-inside: avoid;
-                }
-                
-                /* テーブルレイアウト保持 */
-                table {
-                    border-collapse: collapse;
-                    width: 100%;
-                    page-break-inside: avoid;
-                }
-                
-                /* フッタースタイル */
-                .pdf-footer {
-                    text-align: center;
-                    font-size: 9pt;
-                    color: #666;
-                    margin-top: 20px;
-                    padding-top: 10px;
-                    border-top: 1px solid #ccc;
-                }
-            </style>
-            """
+            base_url_tag = _base_url_tag(url) if url else ""
             
             # スクリプトを選択的に削除（問題のあるJavaScriptのみを削除）
-            problematic_scripts = [
-                r'<script[^>]*google-analytics[^>]*>.*?</script>',
-                r'<script[^>]*gtm\.js[^>]*>.*?</script>',
-                r'<script[^>]*facebook[^>]*>.*?</script>',
-                r'<script[^>]*twitter[^>]*>.*?</script>',
-                r'<script[^>]*ads[^>]*>.*?</script>',
-                r'<script[^>]*analytics[^>]*>.*?</script>',
-                r'<script[^>]*tracker[^>]*>.*?</script>'
-            ]
-            
-            for pattern in problematic_scripts:
-                html_content = re.sub(pattern, '', html_content, flags=re.DOTALL | re.IGNORECASE)
+            html_content = _strip_elements(html_content, 'script', _PROBLEMATIC_SCRIPT_KEYWORDS)
             
             # 問題のあるiframeのみを削除
-            html_content = re.sub(r'<iframe[^>]*(?:advertisement|ads|youtube|vimeo)[^>]*>.*?</iframe>', '', 
-                                html_content, flags=re.DOTALL | re.IGNORECASE)
+            html_content = _strip_elements(html_content, 'iframe', _PROBLEMATIC_IFRAME_KEYWORDS)
+            
+            # 安全なHTML構造を確保（str.findで各タグの位置を1回ずつ求め、抽出にも再利用する）
+            html_start = html_content.find('<html')
+            has_html_tag = html_start != -1 and html_content.find('</html>', html_start) != -1
+            head_start = html_content.find('<head>')
+            head_end = html_content.find('</head>', head_start) if head_start != -1 else -1
+            has_head_tag = head_end != -1
+            body_start = html_content.find('<body')
+            body_open_end = html_content.find('>', body_start) if body_start != -1 else -1
+            body_end = html_content.find('</body>', body_open_end) if body_open_end != -1 else -1
+            has_body_tag = body_end != -1
             
             # 完全なHTML構造を持たない場合は構築
             if not has_html_tag:
-                new_html = "<!DOCTYPE html>\n<html>\n"
+                new_html_parts = ["<!DOCTYPE html>\n<html>\n"]
                 
                 # head要素を追加
                 if not has_head_tag:
-                    new_html += "<head>\n"
-                    new_html += '  <meta charset="UTF-8">\n'
-                    new_html += f'  <meta name="viewport" content="width=device-width, initial-scale=1.0">\n'
+                    new_html_parts.append("<head>\n")
+                    new_html_parts.append('  <meta charset="UTF-8">\n')
+                    new_html_parts.append('  <meta name="viewport" content="width=device-width, initial-scale=1.0">\n')
                     if url:
-                        new_html += f'  <title>Article from {url}</title>\n'
+                        new_html_parts.append(f'  <title>Article from {url}</title>\n')
                     else:
-                        new_html += '  <title>Article</title>\n'
-                    new_html += base_url_tag + "\n"
-                    new_html += pdf_css + "\n"
-                    new_html += "</head>\n"
+                        new_html_parts.append('  <title>Article</title>\n')
+                    new_html_parts.append(base_url_tag + "\n")
+                    new_html_parts.append(_PDF_CSS + "\n")
+                    new_html_parts.append("</head>\n")
                 else:
                     # head要素があれば中身を取り出して拡張
-                    head_match = re.search(r'<head>(.*?)</head>', html_content, re.DOTALL)
-                    if head_match:
-                        head_content = head_match.group(1)
-                        new_html += "<head>\n"
-                        if '<meta charset' not in head_content:
-                            new_html += '  <meta charset="UTF-8">\n'
-                        if '<meta name="viewport"' not in head_content:
-                            new_html += f'  <meta name="viewport" content="width=device-width, initial-scale=1.0">\n'
-                        new_html += base_url_tag + "\n"
-                        new_html += head_content + "\n"
-                        new_html += pdf_css + "\n"
-                        new_html += "</head>\n"
+                    head_content = html_content[head_start + len('<head>'):head_end]
+                    new_html_parts.append("<head>\n")
+                    if '<meta charset' not in head_content:
+                        new_html_parts.append('  <meta charset="UTF-8">\n')
+                    if '<meta name="viewport"' not in head_content:
+                        new_html_parts.append('  <meta name="viewport" content="width=device-width, initial-scale=1.0">\n')
+                    new_html_parts.append(base_url_tag + "\n")
+                    new_html_parts.append(head_content + "\n")
+                    new_html_parts.append(_PDF_CSS + "\n")
+                    new_html_parts.append("</head>\n")
                 
                 # body要素を追加
                 if not has_body_tag:
-                    new_html += "<body>\n"
-                    new_html += html_content + "\n"
+                    new_html_parts.append("<body>\n")
+                    new_html_parts.append(html_content + "\n")
                     
                     # URLフッターを追加
                     if url:
-                        new_html += f'<div class="pdf-footer">Source: {url}</div>\n'
+                        new_html_parts.append(f'<div class="pdf-footer">Source: {url}</div>\n')
                     
-                    new_html += "</body>\n"
+                    new_html_parts.append("</body>\n")
                 else:
                     # body要素があれば抽出して追加
-                    body_match = re.search(r'<body.*?>(.*?)</body>', html_content, re.DOTALL)
-                    if body_match:
-                        body_attributes = re.search(r'<body([^>]*)>', html_content)
-                        body_attrs = body_attributes.group(1) if body_attributes else ""
-                        new_html += f"<body{body_attrs}>\n"
-                        new_html += body_match.group(1) + "\n"
-                        
-                        # URLフッターを追加
-                        if url:
-                            new_html += f'<div class="pdf-footer">Source: {url}</div>\n'
-                        
-                        new_html += "</body>\n"
+                    body_attrs = html_content[body_start + len('<body'):body_open_end]
+                    new_html_parts.append(f"<body{body_attrs}>\n")
+                    new_html_parts.append(html_content[body_open_end + 1:body_end] + "\n")
+                    
+                    # URLフッターを追加
+                    if url:
+                        new_html_parts.append(f'<div class="pdf-footer">Source: {url}</div>\n')
+                    
+                    new_html_parts.append("</body>\n")
                 
-                new_html += "</html>"
-                html_content = new_html
+                new_html_parts.append("</html>")
+                html_content = "".join(new_html_parts)
             else:
                 # 既にHTML構造がある場合は、必要な要素を追加/修正
+                # （探索済みの位置でスライスし、最後に1回だけ結合する）
+                parts = []
+                pos = 0
                 
                 # head内にベースURLとPDF用CSSを追加
                 if has_head_tag:
+                    parts.append(html_content[:head_end])
                     if base_url_tag and '<base' not in html_content:
-                        html_content = html_content.replace('</head>', f'{base_url_tag}\n</head>')
-                    html_content = html_content.replace('</head>', f'{pdf_css}\n</head>')
+                        parts.append(f'{base_url_tag}\n')
+                    parts.append(f'{_PDF_CSS}\n')
+                    pos = head_end
                 
                 # body終了タグの前にURLフッターを追加
-                if has_body_tag and url:
-                    footer_html = f'<div class="pdf-footer">Source: {url}</div>\n'
-                    html_content = html_content.replace('</body>', f'{footer_html}</body>')
+                if has_body_tag and url and body_end >= pos:
+                    parts.append(html_content[pos:body_end])
+                    parts.append(f'<div class="pdf-footer">Source: {url}</div>\n')
+                    pos = body_end
+                
+                if parts:
+                    parts.append(html_content[pos:])
+                    html_content = "".join(parts)
             
             return html_content
                 
@@ -1022,89 +2406,16 @@ class HTMLProcessor:
         Returns:
             str: 整形されたHTML
         """
-        # CSS設定
-        css = """
-        <style>
-            /* ページ設定 */
-            @page {
-                size: A4;
-                margin: 10mm 10mm 15mm 10mm;
-            }
-            
-            /* 基本設定 */
-            body {
-                font-family: Arial, Helvetica, sans-serif;
-                font-size: 12pt;
-                line-height: 1.5;
-                color: #000;
-                background-color: #fff;
-                margin: 0;
-                padding: 20px;
-            }
-            
-            /* 記事コンテナ */
-            .article-container {
-                max-width: 100%;
-                margin: 0 auto;
-            }
-            
-            /* タイトル */
-            .article-title {
-                font-size: 24pt;
-                font-weight: bold;
-                margin-bottom: 20px;
-                line-height: 1.2;
-                color: #333;
-            }
-            
-            /* メイン画像 */
-            .main-image {
-                max-width: 100%;
-                height: auto;
-                margin: 20px 0;
-                display: block;
-            }
-            
-            /* 記事本文 */
-            .article-content {
-                margin-top: 20px;
-                font-size: 12pt;
-                line-height: 1.6;
-            }
-            
-            /* 段落 */
-            .article-content p {
-                margin: 12px 0;
-            }
-            
-            /* 画像 */
-            .article-content img {
-                max-width: 100%;
-                height: auto;
-                margin: 15px 0;
-                display: block;
-            }
-            
-            /* フッター */
-            .article-footer {
-                margin-top: 30px;
-                padding-top: 10px;
-                border-top: 1px solid #ccc;
-                font-size: 10pt;
-                color: #666;
-                text-align: center;
-            }
-        </style>
-        """
-        
         # テキストを段落に分割
         paragraphs = text.split('\n\n')
         
         # 記事本文をHTMLに変換
-        content_html = ""
+        content_parts = []
         for paragraph in paragraphs:
-            if paragraph.strip():
-                content_html += f"<p>{paragraph.strip()}</p>\n"
+            paragraph = paragraph.strip()
+            if paragraph:
+                content_parts.append(f"<p>{paragraph}</p>")
+        content_html = "\n".join(content_parts)
         
         # 本文中の画像を追加（指定された場合）
         image_html = ""
@@ -1115,26 +2426,27 @@ class HTMLProcessor:
                 used_images.add(top_image)
             
             # 記事内の画像（最大5枚まで）
-            image_count = 0
+            parsed_base = urlsplit(url) if url else None
+            selected_images = []
             for img_url in images:
-                if img_url not in used_images and image_count < 5:
-                    # 相対URLを絶対URLに変換
-                    if url and not img_url.startswith(('http://', 'https://')):
-                        img_url = urljoin(url, img_url)
-                    
-                    # 段落の間に画像を挿入（コンテンツの適切な位置に）
-                    insert_pos = min(
-                        len(content_html) // 2 + image_count * (len(content_html) // 10),
-                        len(content_html) - 1
-                    )
-                    content_html = (
-                        content_html[:insert_pos] + 
-                        f'<img src="{img_url}" alt="" class="article-image" />\n' + 
-                        content_html[insert_pos:]
-                    )
-                    
+                if len(selected_images) >= 5:
+                    break
+                # 相対URLを絶対URLに変換してから重複を判定
+                if url:
+                    img_url = _fast_urljoin(url, parsed_base, img_url)
+                if img_url not in used_images:
+                    selected_images.append(img_url)
                     used_images.add(img_url)
-                    image_count += 1
+            
+            # 段落の間に画像を等間隔で挿入（段落単位で挿入し、大きな文字列の再結合を避ける）
+            if selected_images:
+                step = max(1, len(content_parts) // (len(selected_images) + 1))
+                for i, img_url in enumerate(selected_images):
+                    content_parts.insert(
+                        (i + 1) * step + i,
+                        f'<img src="{img_url}" alt="" class="article-image" />'
+                    )
+                content_html = "\n".join(content_parts)
         
         # HTML文書の構築
         html = f"""<!DOCTYPE html>
@@ -1143,7 +2455,7 @@ class HTMLProcessor:
             <meta charset="UTF-8">
             <meta name="viewport" content="width=device-width, initial-scale=1.0">
             <title>{title}</title>
-            {css}
+            {_ARTICLE_CSS}
         </head>
         <body>
             <div class="article-container">
@@ -1172,58 +2484,7 @@ class HTMLProcessor:
         Returns:
             str: CSSスタイルタグ
         """
-        return """
-        <style>
-            /* 本文コンテンツの強制表示 */
-            article, .article, main, .main, .content, .post, .entry, [itemprop="articleBody"], .story {
-                display: block !important;
-                width: 100% !important;
-                max-width: 100% !important;
-                position: static !important;
-                overflow: visible !important;
-                padding: 10px 0 !important;
-                margin: 0 auto !important;
-                float: none !important;
-            }
-            
-            /* コンテンツ画像の保持と最適化 */
-            .content-image-preserve {
-                display: block !important;
-                max-width: 90% !important;
-                height: auto !important;
-                margin: 10px auto !important;
-                page-break-inside: avoid !important;
-            }
-            
-            /* 見出し最適化 */
-            h1, h2, h3 {
-                page-break-after: avoid !important;
-                margin-top: 20px !important;
-                margin-bottom: 10px !important;
-            }
-            
-            /* テキスト最適化 */
-            p {
-                margin: 10px 0 !important;
-                line-height: 1.5 !important;
-            }
-            
-            /* 大きな画像のページ内表示 */
-            img {
-                page-break-inside: avoid !important;
-            }
-            
-            /* フッタースタイル */
-            .pdf-footer {
-                text-align: center;
-                font-size: 9pt;
-                color: #666;
-                margin-top: 20px;
-                padding-top: 10px;
-                border-top: 1px solid #ccc;
-            }
-        </style>
-        """
+        return _LAYOUT_REPAIR_CSS
     
     def _get_common_headers(self):
         """
@@ -1232,15 +2493,7 @@ class HTMLProcessor:
         Returns:
             dict: HTTPヘッダー辞書
         """
-        return {
-            'User-Agent': self.user_agent,
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8',
-            'Accept-Language': 'en-US,en;q=0.9',
-            'Accept-Encoding': 'gzip, deflate, br',
-            'Connection': 'keep-alive',
-            'Referer': 'https://www.google.com/',
-            'Cache-Control': 'max-age=0'
-        }
+        return {'User-Agent': self.user_agent, **self.COMMON_HEADERS}
     
     def _get_advanced_headers(self):
         """
@@ -1249,24 +2502,7 @@ class HTMLProcessor:
         Returns:
             dict: 拡張HTTPヘッダー辞書
         """
-        return {
-            'User-Agent': self.user_agent,
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8,application/signed-exchange;v=b3;q=0.7',
-            'Accept-Language': 'en-US,en;q=0.9,ja;q=0.8',
-            'Accept-Encoding': 'gzip, deflate, br',
-            'Connection': 'keep-alive',
-            'Upgrade-Insecure-Requests': '1',
-            'Sec-Fetch-Dest': 'document',
-            'Sec-Fetch-Mode': 'navigate',
-            'Sec-Fetch-Site': 'none',
-            'Sec-Fetch-User': '?1',
-            'DNT': '1',
-            'Referer': 'https://www.google.com/',
-            'Cache-Control': 'max-age=0',
-            'sec-ch-ua': '"Google Chrome";v="115", "Chromium";v="115", "Not/A)Brand";v="99"',
-            'sec-ch-ua-mobile': '?0',
-            'sec-ch-ua-platform': '"Windows"'
-        }
+        return {'User-Agent': self.user_agent, **self.ADVANCED_HEADERS}
     
     def _cleanup_temp_files(self, file_paths):
         """
@@ -1276,12 +2512,16 @@ class HTMLProcessor:
             file_paths: 削除するファイルパスのリスト
         """
         for file_path in file_paths:
-            if file_path and os.path.exists(file_path):
-                try:
-                    os.unlink(file_path)
-                    self.log(f"Deleted temp file: {file_path}")
-                except Exception as e:
-                    self.log(f"Failed to delete temp file {file_path}: {str(e)}", "warning")
+            if not file_path:
+                continue
+            # 存在確認をせずに削除を試みる（存在しない場合は何もしない）
+            try:
+                os.unlink(file_path)
+                self.log(f"Deleted temp file: {file_path}")
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                self.log(f"Failed to delete temp file {file_path}: {str(e)}", "warning")
     
     def _cleanup_temp_file(self, file_path):
         """
@@ -1290,16 +2530,45 @@ class HTMLProcessor:
         Args:
             file_path: 削除するファイルのパス
         """
-        if file_path and os.path.exists(file_path):
-            try:
-                os.unlink(file_path)
-            except Exception as e:
-                self.log(f"Failed to delete temp file {file_path}: {str(e)}", "warning")
+        if not file_path:
+            return
+        try:
+            os.unlink(file_path)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            self.log(f"Failed to delete temp file {file_path}: {str(e)}", "warning")
 
     def _is_wordpress_site(self, html_content, url):
         """
         WordPressサイトかどうかを検出 - 強化版
         
+        一度WordPressと判定したドメインは、以降の記事で検出処理を省略する。
+        
+        Args:
+            html_content: HTML内容
+            url: 記事URL
+            
+        Returns:
+            bool: WordPressサイトの場合True
+        """
+        netloc = urlparse(url).netloc.lower() if url else ""
+        if netloc and netloc in self._wp_netlocs:
+            if self.debug_mode:
+                self.log(f"WordPress site already detected for domain: {netloc}")
+            return True
+        
+        is_wordpress = self._detect_wordpress(html_content, url)
+        if is_wordpress and netloc:
+            if len(self._wp_netlocs) >= 512:
+                self._wp_netlocs.clear()
+            self._wp_netlocs.add(netloc)
+        return is_wordpress
+    
+    def _detect_wordpress(self, html_content, url):
+        """
+        HTMLとURLのパターンからWordPressサイトかどうかを判定
+        
         Args:
             html_content: HTML内容
             url: 記事URL
@@ -1308,29 +2577,29 @@ class HTMLProcessor:
             bool: WordPressサイトの場合True
         """
         # 処理開始のログ（デバッグモード時のみ）
-        if hasattr(self, 'debug_mode') and self.debug_mode:
+        if self.debug_mode:
             self.log(f"Checking if site is WordPress: {url}")
         
         # ===== 既存の検出方法 =====
         
+        # 大文字小文字を区別しないパターンのリテラル事前判定用
+        lowered = html_content.lower()
+        
         # 検出方法 (1) - メタジェネレータータグで検出
-        if re.search(r'<meta[^>]*name=["\']generator["\'][^>]*content=["\']WordPress', html_content, re.IGNORECASE):
+        if 'wordpress' in lowered and _WP_META_GENERATOR_RE.search(html_content):
             self.log("WordPress site detected via meta generator tag")
             return True
             
         # 検出方法 (2) - 特定のリソースパターンで検出
-        if re.search(r'wp-(?:content|includes)', html_content):
+        if _contains_any(html_content, _WP_RESOURCE_MARKERS):
             self.log("WordPress site detected via resource patterns")
             return True
         
         # 検出方法 (3) - WordPressテーマに特有のクラス検出
-        wp_classes = [
-            'wp-block-', 'entry-content', 'post-content', 'the-content',
-            'widget-area', 'site-header', 'site-footer', 'wp-caption'
-        ]
-        for wp_class in wp_classes:
-            if re.search(f'class=["\'][^"\']*{wp_class}', html_content):
-                self.log(f"WordPress site detected via class '{wp_class}'")
+        if 'class=' in html_content and _contains_any(html_content, _WP_CLASS_TOKENS):
+            class_match = _WP_CLASS_RE.search(html_content)
+            if class_match:
+                self.log(f"WordPress site detected via class '{class_match.group('wp_class')}'")
                 return True
         
         # 検出方法 (4) - URLを確認
@@ -1341,87 +2610,38 @@ class HTMLProcessor:
         # ===== HackerNewsサイトから学んだパターン =====
         
         # 検出方法 (5) - Blogger/WordPress共通画像パターン検出
-        if re.search(r'blogger\.googleusercontent\.com/img/', html_content):
+        if _BLOGGER_IMAGE_MARKER in html_content:
             self.log("WordPress site detected via Blogger image pattern")
             return True
         
         # 検出方法 (6) - 年/月/タイトル.html の典型的なブログURL構造
-        if url and re.search(r'/(20\d{2})/(0[1-9]|1[0-2])/[\w-]+\.html', url):
+        if url and '.html' in url and _BLOG_PERMALINK_RE.search(url):
             self.log("WordPress site detected via permalink structure")
             return True
         
-        # 検出方法 (7) - 拡張WordPress記事構造検出
-        article_patterns = [
-            # 記事コンテナ
-            r'<article[^>]*class=["\'][^"\']*(?:post|entry|blog-post)',
-            # 投稿タイトル
-            r'<h\d[^>]*class=["\'][^"\']*(?:post-title|entry-title)',
-            # 投稿メタ情報
-            r'<div[^>]*class=["\'][^"\']*(?:post-meta|entry-meta)',
-            # 一般的なコメントセクション
-            r'<div[^>]*id=["\'](?:comments|respond)',
-            # 共有ボタン
-            r'<div[^>]*class=["\'][^"\']*(?:share-buttons|social-share)',
-            # 典型的なRSS/AtomフィードURL
-            r'<link[^>]*rel=["\']alternate["\'][^>]*type=["\']application/(?:rss\+xml|atom\+xml)'
-        ]
-        
-        # いずれかのパターンが一致すればWordPressと判定
-        for pattern in article_patterns:
-            if re.search(pattern, html_content, re.IGNORECASE):
-                self.log(f"WordPress site detected via extended article pattern")
-                return True
-        
         # 検出方法 (8) - WordPress埋め込みJavaScriptシグネチャ
-        js_patterns = [
-            r'wp-embed\.min\.js', 
-            r'wp-emoji-release\.min\.js',
-            r'jquery/jquery\.js\?ver=',
-            r'wp-includes/js/',
-            r'_wpnonce'
-        ]
-        
-        for pattern in js_patterns:
-            if re.search(pattern, html_content):
-                self.log(f"WordPress site detected via JavaScript pattern")
-                return True
+        if _contains_any(html_content, _WP_JS_NEEDLES) and _WP_JS_MARKERS.search(html_content):
+            self.log(f"WordPress site detected via JavaScript pattern")
+            return True
         
         # ===== TheRecordサイトから学んだパターン =====
         
         # 検出方法 (9) - Markdownリンク構文検出
-        if re.search(r'\[[\w\s]+\]\(https?://[^\)]+\)', html_content):
+        if '](http' in html_content and _MARKDOWN_LINK_RE.search(html_content):
             self.log("WordPress site detected via Markdown link syntax")
             return True
         
-        # 検出方法 (10) - 拡張記事構造パターン
-        enhanced_article_patterns = [
-            # レポーター/著者情報ブロック
-            r'<div[^>]*(?:author|byline)[^>]*>.*?<\/div>',
-            # 関連記事セクションパターン
-            r'<div[^>]*(?:related|more-stories)[^>]*>.*?<\/div>',
-            # 記事メタデータパターン
-            r'<div[^>]*(?:meta|article-info)[^>]*>.*?<\/div>'
-        ]
-        
-        for pattern in enhanced_article_patterns:
-            if re.search(pattern, html_content, re.IGNORECASE | re.DOTALL):
-                self.log("WordPress site detected via enhanced article structure pattern")
-                return True
-        
-        # 検出方法 (11) - ヘッダー/フッター構造（HackerNewsの拡張）
-        header_footer_patterns = [
-            r'<header[^>]*class=["\'][^"\']*(?:site-header|main-header)',
-            r'<footer[^>]*class=["\'][^"\']*(?:site-footer|main-footer)',
-            r'<div[^>]*class=["\'][^"\']*(?:copyright|site-info)'
-        ]
+        # ===== 記事構造パターン =====
         
-        for pattern in header_footer_patterns:
-            if re.search(pattern, html_content, re.IGNORECASE):
-                self.log(f"WordPress site detected via header/footer pattern")
+        # 検出方法 (7)(10)(11) - 拡張記事構造、ヘッダー/フッター構造（統合した正規表現で1回だけ走査）
+        if _contains_any(lowered, _WP_STRUCTURE_NEEDLES):
+            structure_match = _WP_STRUCTURE_RE.search(html_content)
+            if structure_match:
+                self.log(f"WordPress site detected via {_WP_STRUCTURE_LABELS[structure_match.lastgroup]}")
                 return True
         
         # どのパターンにも一致しなかった場合
-        if hasattr(self, 'debug_mode') and self.debug_mode:
+        if self.debug_mode:
             self.log(f"No WordPress patterns detected for: {url}")
         
         return False
@@ -1430,6 +2650,9 @@ class HTMLProcessor:
         """
         WordPressサイト専用のHTML処理 - 強化版
         
+        解析・URL処理のエラー時は元のHTMLを返す。それ以外の例外は不具合として
+        呼び出し元（convert_html_to_pdf）に伝播させる。
+        
         Args:
             html_content: 元のHTML内容
             url: 記事URL
@@ -1439,210 +2662,145 @@ class HTMLProcessor:
         """
         self.log("Applying WordPress-specific processing with enhanced layout")
         
+        # フィードの再取得で同じ記事が届いた場合は前回の整形結果を再利用
+        cache_key = (len(html_content), hash(html_content), url)
+        cached_html = self._wp_render_cache.get(cache_key)
+        if cached_html is not None:
+            self.log("Reusing cached WordPress processing result")
+            return cached_html
+        
         try:
             # ドキュメントをパース
-            doc = html.document_fromstring(html_content)
-            
-            # 1. 不要な要素を削除
-            elements_to_remove = [
-                # コメントセクションなど既存の削除対象
-                '.comments-area', '#comments', '.comment-respond',
-                '.sidebar', '.widget-area', '.widgets-list',
-                '.related-posts', '.yarpp', '.jp-relatedposts',
-                '.sharedaddy', '.share-buttons', '.social-share',
-                '.post-navigation', '.nav-links', '.prev-next',
-                '.advertisement', '.adsbygoogle', '[id*="gpt"]', '[class*="ads-"]',
-                # さらに追加の不要要素
-                '.popup', '.modal', '.cookie-notice', '.gdpr', 
-                'script', 'iframe[src*="ads"]', 'iframe[src*="doubleclick"]'
-            ]
+            doc = self._parse_once(html_content)
             
-            for selector in elements_to_remove:
-                try:
-                    for element in doc.cssselect(selector):
-                        if element.getparent() is not None:
-                            element.getparent().remove(element)
-                except Exception as e:
-                    if self.debug_mode:
-                        self.log(f"Error removing element with selector {selector}: {str(e)}", "warning")
-                    continue
+            # 1. 不要な要素を削除（統合済みセレクタで1回だけ走査）
+            for element in _WP_REMOVE_SELECTOR(doc):
+                if element.getparent() is not None:
+                    element.getparent().remove(element)
             
             # 2. メインコンテンツを特定 - 優先順位付きセレクタリスト
-            main_content = None
-            main_selectors = [
-                'article.post', # 最優先
-                'article .entry-content',
-                '.post-content',
-                '.post .entry-content',
-                'article.post',
-                '.the-content',
-                '#content .post',
-                '.entry-content',
-                'article',
-                '.post',
-                '.content',
-                # 追加セレクタ
-                'main',
-                '.main-content',
-                '#primary',
-                '.site-content article'
-            ]
+            main_selectors = _WP_MAIN_SELECTORS
             
             # 3. テーマ検出を追加
-            theme_pattern = re.search(r'wp-content/themes/([^/]+)', html_content)
+            theme_pattern = _WP_THEME_RE.search(html_content)
             detected_theme = theme_pattern.group(1) if theme_pattern else None
             
             if detected_theme:
                 self.log(f"Detected WordPress theme: {detected_theme}")
                 # テーマ固有のセレクタを追加
-                if detected_theme in ['twentytwenty', 'twentytwentyone', 'twentytwentytwo']:
-                    main_selectors.insert(0, '.entry-content')
-                    main_selectors.insert(0, 'article .entry')
-                elif detected_theme in ['astra', 'generatepress', 'oceanwp']:
-                    main_selectors.insert(0, '.ast-article-single')
-                    main_selectors.insert(0, '.content-area')
+                main_selectors = _WP_THEME_MAIN_SELECTORS.get(detected_theme, main_selectors)
             
             # コンテンツ探索
-            for selector in main_selectors:
-                try:
-                    elements = doc.cssselect(selector)
-                    if elements:
-                        main_content = elements[0]
-                        self.log(f"Found main content using selector: {selector}")
-                        break
-                except Exception as e:
-                    if self.debug_mode:
-                        self.log(f"Error with selector {selector}: {str(e)}", "warning")
-                    continue
+            selector, main_content = _select_first(doc, main_selectors)
+            if main_content is not None:
+                self.log(f"Found main content using selector: {selector}")
             
             # 4. タイトル、メタ情報、アイキャッチ画像を取得
             title_text = "Article"
-            title_selectors = ['h1.entry-title', 'h1.post-title', '.post h1', 'h1.title', 'header h1']
-            for selector in title_selectors:
-                try:
-                    title_elements = doc.cssselect(selector)
-                    if title_elements:
-                        title_text = title_elements[0].text_content().strip()
-                        break
-                except:
-                    continue
+            _, title_element = _select_first(doc, _WP_TITLE_SELECTORS)
+            if title_element is not None:
+                title_text = title_element.text_content().strip()
             
             # 5. 公開日を取得
             publish_date = ""
-            date_selectors = ['.posted-on time', '.entry-date', '.post-date', 'time.entry-date', 'meta time']
-            for selector in date_selectors:
-                try:
-                    date_elements = doc.cssselect(selector)
-                    if date_elements:
-                        publish_date = date_elements[0].text_content().strip()
-                        break
-                except:
-                    continue
+            _, date_element = _select_first(doc, _WP_DATE_SELECTORS)
+            if date_element is not None:
+                publish_date = date_element.text_content().strip()
             
             # 6. 著者を取得
             author = ""
-            author_selectors = ['.author', '.byline', '.post-author', '.entry-author']
-            for selector in author_selectors:
-                try:
-                    author_elements = doc.cssselect(selector)
-                    if author_elements:
-                        author = author_elements[0].text_content().strip()
-                        # "By "などの接頭辞を削除
-                        author = re.sub(r'^(By|Posted by|Author[:]?)\s*', '', author, flags=re.IGNORECASE).strip()
-                        break
-                except:
-                    continue
+            _, author_element = _select_first(doc, _WP_AUTHOR_SELECTORS)
+            if author_element is not None:
+                author = author_element.text_content().strip()
+                # "By "などの接頭辞を削除
+                author = _AUTHOR_PREFIX_RE.sub('', author).strip()
+            
+            # 相対URLの解決結果（この文書内でのみ再利用し、記事をまたいで保持しない）
+            resolved_urls = {}
             
             # 7. アイキャッチ画像を取得
-            featured_image = None
-            image_selectors = ['.post-thumbnail img', '.featured-image img', '.post-image img', 'article img:first-child']
-            for selector in image_selectors:
-                try:
-                    img_elements = doc.cssselect(selector)
-                    if img_elements:
-                        featured_image = img_elements[0]
-                        # 相対URLを絶対URLに変換
-                        if 'src' in featured_image.attrib and not featured_image.attrib['src'].startswith(('http://', 'https://')):
-                            if url:
-                                featured_image.attrib['src'] = urljoin(url, featured_image.attrib['src'])
-                        break
-                except:
-                    continue
+            _, featured_image = _select_first(doc, _WP_IMAGE_SELECTORS)
+            if featured_image is not None:
+                # 相対URLを絶対URLに変換
+                attrib = featured_image.attrib
+                src = attrib.get('src')
+                if src is not None and not src.startswith(_ABSOLUTE_URL_PREFIXES):
+                    if url:
+                        attrib['src'] = _cached_urljoin(resolved_urls, url, src)
             
             # メインコンテンツが見つかった場合、元のサイトに似たHTMLを構築
             if main_content is not None:
-                # 8. 画像要素を絶対URLに変換
-                for img in main_content.cssselect('img'):
-                    if 'src' in img.attrib:
-                        src = img.attrib['src']
-                        if not src.startswith(('http://', 'https://')):
-                            if url:
-                                img.attrib['src'] = urljoin(url, src)
-                    # レスポンシブ画像の最適化
-                    img.attrib['style'] = 'max-width: 100%; height: auto;'
-                    # LazyLoad属性を処理
-                    if 'data-src' in img.attrib and not img.attrib.get('src', ''):
-                        img.attrib['src'] = img.attrib['data-src']
-                
-                # 9. リンク要素を絶対URLに変換
-                for a in main_content.cssselect('a'):
-                    if 'href' in a.attrib:
-                        href = a.attrib['href']
-                        if not href.startswith(('http://', 'https://', '#', 'mailto:')):
-                            if url:
-                                a.attrib['href'] = urljoin(url, href)
+                # 8. 画像要素、9. リンク要素を絶対URLに変換（1回の走査で両方を処理）
+                # 属性の存在確認と取得はget()の1回で行う
+                # URLが無い場合はリンクの書き換えが不要なため、画像のみを走査する
+                do_join = bool(url)
+                target_tags = ('img', 'a') if do_join else ('img',)
+                for element in main_content.iter(*target_tags):
+                    attrib = element.attrib
+                    if element.tag == 'img':
+                        src = attrib.get('src')
+                        if do_join and src is not None and not src.startswith(_ABSOLUTE_URL_PREFIXES):
+                            src = _cached_urljoin(resolved_urls, url, src)
+                            attrib['src'] = src
+                        # レスポンシブ画像の最適化（既存のインラインスタイルは残して末尾に追加）
+                        style = attrib.get('style')
+                        if not style:
+                            attrib['style'] = _RESPONSIVE_STYLE
+                        elif _RESPONSIVE_STYLE not in style:
+                            attrib['style'] = f'{style}; {_RESPONSIVE_STYLE}'
+                        # LazyLoad属性を処理
+                        if not src:
+                            data_src = attrib.get('data-src')
+                            if data_src is not None:
+                                attrib['src'] = data_src
+                    else:
+                        href = attrib.get('href')
+                        if href is not None and not href.startswith(_LINK_SKIP_PREFIXES):
+                            attrib['href'] = _cached_urljoin(resolved_urls, url, href)
                 
-                # 10. WordPressのショートコードを削除
-                main_html = html.tostring(main_content).decode('utf-8')
-                main_html = re.sub(r'\[\/?[a-zA-Z0-9_-]+(?:\s[^\]]+)?\]', '', main_html)
+                # 10. WordPressのショートコードを削除（ツリーのテキストに直接適用し、シリアライズは1回のみ）
+                # '['を含まないテキストノードは正規表現を実行せずに読み飛ばす
+                for element in main_content.iter():
+                    text = element.text
+                    if text and '[' in text:
+                        element.text = _SHORTCODE_RE.sub('', text)
+                    tail = element.tail
+                    if tail and '[' in tail:
+                        element.tail = _SHORTCODE_RE.sub('', tail)
+                main_html = html.tostring(main_content, encoding='unicode')
                 
                 # 11. WordPressテーマに似せたCSSスタイルを構築
                 wordpress_style = self._get_wordpress_theme_css(detected_theme)
+                theme_class = detected_theme or 'default'
                 
-                # 12. HTML文書の構築
-                return f"""<!DOCTYPE html>
-                <html>
-                <head>
-                    <meta charset="UTF-8">
-                    <title>{title_text}</title>
-                    {wordpress_style}
-                </head>
-                <body class="wordpress-theme {detected_theme if detected_theme else 'default'}">
-                    <div id="page" class="site">
-                        <div id="content" class="site-content">
-                            <article class="post">
-                                <header class="entry-header">
-                                    <h1 class="entry-title">{title_text}</h1>
-                                    <div class="entry-meta">
-                                        {f'<span class="posted-on">{publish_date}</span>' if publish_date else ''}
-                                        {f'<span class="byline">{author}</span>' if author else ''}
-                                    </div>
-                                </header>
-                                
-                                {f'<div class="post-thumbnail">{html.tostring(featured_image).decode("utf-8")}</div>' if featured_image is not None else ''}
-                                
-                                <div class="entry-content">
-                                    {main_html}
-                                </div>
-                                
-                                <footer class="entry-footer">
-                                    <div class="source-link">
-                                        Source: <a href="{url}">{url}</a>
-                                    </div>
-                                </footer>
-                            </article>
-                        </div>
-                    </div>
-                </body>
-                </html>
-                """
-        
-        except Exception as e:
-            self.log(f"Error in WordPress processing: {str(e)}", "error")
-            if self.helper:
-                self.helper.log_error(traceback.format_exc())
+                # 12. メタ情報（公開日・著者）は存在するものだけを連結
+                meta_parts = []
+                if publish_date:
+                    meta_parts.append(f'<span class="posted-on">{publish_date}</span>')
+                if author:
+                    meta_parts.append(f'<span class="byline">{author}</span>')
+                
+                # 13. HTML文書の構築（テーマ固有部分はテーマごとに1回だけ埋め込み、記事固有部分のみを流し込む）
+                # StringIOに書き溜めるとgetvalue()で本文をもう一度コピーするため、format_mapで直接組み立てる
+                rendered_html = _wp_theme_doc_template(theme_class, wordpress_style).format_map({
+                    'title': title_text,
+                    'meta': ' '.join(meta_parts),
+                    'thumbnail': f'<div class="post-thumbnail">{html.tostring(featured_image, encoding="unicode")}</div>' if featured_image is not None else '',
+                    'main_html': main_html,
+                    'url': url,
+                })
+                if len(self._wp_render_cache) >= self.WP_RENDER_CACHE_SIZE:
+                    self._wp_render_cache.clear()
+                self._wp_render_cache[cache_key] = rendered_html
+                return rendered_html
+        
+        except (etree.XMLSyntaxError, etree.ParserError, ValueError, KeyError) as e:
+            self._wp_fallback_count += 1
+            self.log(f"Error in WordPress processing: {str(e)} (fallback count: {self._wp_fallback_count})", "error")
+            self._log_traceback()
             return html_content  # エラー時は元のHTMLを返す
         
+        self._wp_fallback_count += 1
         return html_content  # 変更がない場合も元のHTMLを返す
 
     def _get_wordpress_theme_css(self, theme_name=None):
@@ -1655,177 +2813,5 @@ class HTMLProcessor:
         Returns:
             str: スタイルタグを含むCSS
         """
-        # 基本CSS（すべてのテーマに適用）
-        base_css = """
-        <style>
-            /* 基本レイアウト */
-            body {
-                font-family: -apple-system, BlinkMacSystemFont, "Segoe UI", Roboto, Oxygen-Sans, Ubuntu, Cantarell, "Helvetica Neue", sans-serif;
-                font-size: 16px;
-                line-height: 1.8;
-                color: #333;
-                margin: 0;
-                padding: 0;
-                background: #fff;
-            }
-            #page {
-                max-width: 1200px;
-                margin: 0 auto;
-                padding: 2em;
-            }
-            #content {
-                width: 100%;
-            }
-            
-            /* タイトルとヘッダー */
-            .entry-title {
-                font-size: 2.5em;
-                line-height: 1.2;
-                margin-bottom: 0.5em;
-                color: #222;
-                font-weight: 700;
-            }
-            .entry-meta {
-                font-size: 0.9em;
-                color: #666;
-                margin-bottom: 2em;
-            }
-            .byline, .posted-on {
-                margin-right: 1em;
-            }
-            
-            /* アイキャッチ画像 */
-            .post-thumbnail {
-                margin-bottom: 2em;
-                text-align: center;
-            }
-            .post-thumbnail img {
-                max-width: 100%;
-                height: auto;
-                border-radius: 4px;
-            }
-            
-            /* 記事コンテンツ */
-            .entry-content {
-                font-size: 1.1em;
-                line-height: 1.8;
-            }
-            .entry-content p {
-                margin-bottom: 1.5em;
-            }
-            .entry-content h2 {
-                font-size: 1.8em;
-                margin-top: 1.5em;
-                margin-bottom: 0.8em;
-                padding-bottom: 0.3em;
-                border-bottom: 1px solid #eee;
-            }
-            .entry-content h3 {
-                font-size: 1.5em;
-                margin-top: 1.5em;
-                margin-bottom: 0.8em;
-            }
-            .entry-content ul, .entry-content ol {
-                margin-bottom: 1.5em;
-                padding-left: 2em;
-            }
-            .entry-content li {
-                margin-bottom: 0.5em;
-            }
-            .entry-content a {
-                color: #0066cc;
-                text-decoration: none;
-            }
-            .entry-content a:hover {
-                text-decoration: underline;
-            }
-            .entry-content img {
-                max-width: 100%;
-                height: auto;
-                margin: 1.5em 0;
-                border-radius: 4px;
-            }
-            .entry-content blockquote {
-                border-left: 4px solid #eee;
-                padding-left: 1.5em;
-                margin-left: 0;
-                color: #666;
-                font-style: italic;
-            }
-            .entry-content pre, .entry-content code {
-                background: #f5f5f5;
-                border-radius: 3px;
-                padding: 0.2em 0.4em;
-                font-family: monospace;
-            }
-            .entry-content pre {
-                padding: 1em;
-                overflow-x: auto;
-            }
-            
-            /* フッター */
-            .entry-footer {
-                margin-top: 3em;
-                padding-top: 1em;
-                border-top: 1px solid #eee;
-                font-size: 0.9em;
-                color: #666;
-            }
-            .source-link {
-                margin-top: 1em;
-            }
-            
-            /* 印刷用最適化 */
-            @page {
-                margin: 1.5cm;
-            }
-            @media print {
-                body {
-                    font-size: 12pt;
-                }
-                a {
-                    text-decoration: none;
-                    color: #000;
-                }
-                .entry-title {
-                    font-size: 24pt;
-                }
-                .entry-content {
-                    font-size: 12pt;
-                }
-            }
-        </style>
-        """
-        
-        # テーマ固有のCSS（検出されたテーマに基づいて追加）
-        theme_specific_css = ""
-        if theme_name:
-            if theme_name in ['twentytwenty', 'twentytwentyone', 'twentytwentytwo']:
-                theme_specific_css = """
-                <style>
-                    body.wordpress-theme {
-                        font-family: "Inter", -apple-system, BlinkMacSystemFont, "Segoe UI", Roboto, Oxygen-Sans, Ubuntu, Cantarell, "Helvetica Neue", sans-serif;
-                    }
-                    .entry-title {
-                        font-weight: 800;
-                    }
-                    .entry-content h2 {
-                        font-weight: 700;
-                    }
-                </style>
-                """
-            elif theme_name in ['astra', 'generatepress']:
-                theme_specific_css = """
-                <style>
-                    body.wordpress-theme {
-                        font-size: 17px;
-                        line-height: 1.7;
-                    }
-                    .entry-title {
-                        font-weight: 600;
-                    }
-                </style>
-                """
-        
-        return base_css + theme_specific_css
+        return _WP_THEME_CSS.get(theme_name, _WP_BASE_CSS)
 
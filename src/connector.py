@@ -154,6 +154,12 @@ class RssReportEnhancerConnector:
             "auto"
         )
         
+        # 常駐wkhtmltopdfワーカープールを使用するか
+        self.use_pdf_worker_pool = self.config_manager.get_value(
+            "USE_PDF_WORKER_POOL", ["connector", "use_pdf_worker_pool"], 
+            False, is_boolean=True
+        )
+        
 
     def _initialize_modules(self):
         """モジュールを初期化"""
@@ -163,6 +169,9 @@ class RssReportEnhancerConnector:
         
         # HTML プロセッサ
         self.html_processor = HTMLProcessor(helper=self.helper)
+        self.html_processor.set_debug_mode(self.debug_mode)
+        if self.use_pdf_worker_pool:
+            self.html_processor.start_pdf_pool(self.wkhtmltopdf_path)
         
         # ファイル操作
         self.file_operations = FileOperations(
@@ -213,6 +222,7 @@ class RssReportEnhancerConnector:
         self.helper.log_info(f"Processed label: {self.processed_label}")
         self.helper.log_info(f"PDF options: preserve_layout={self.preserve_original_layout}, include_images={self.include_images_in_pdf}")
         self.helper.log_info(f"Ad removal strategy: {self.ad_removal_strategy}")  # 新規追加
+        self.helper.log_info(f"PDF worker pool: {self.use_pdf_worker_pool}")
         if self.include_images_in_pdf:
             self.helper.log_info(f"PDF image quality: {self.pdf_image_quality}, max_images: {self.max_images_in_pdf}")
         self.helper.log_info(f"Debug mode: {self.debug_mode}")